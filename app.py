@@ -26,6 +26,7 @@ import argparse
 import importlib
 import importlib.util
 import json
+import multiprocessing
 import os
 import sys
 import threading
@@ -242,4 +243,6 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
 
 
 if __name__ == "__main__":
+    # 打包后日志解析的多进程子进程需要从这里分流
+    multiprocessing.freeze_support()
     raise SystemExit(main())
\ No newline at end of file
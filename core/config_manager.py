@@ -1,8 +1,9 @@
 # core/config_manager.py
+import copy
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .json_store import JsonStore
 
@@ -14,6 +15,10 @@ class ConfigManager:
         self.logger = logging.getLogger(__name__)
         os.makedirs(config_dir, exist_ok=True)
         self._store = JsonStore(self.server_configs_file, default_factory=list)
+        # 按 id、(厂区, 系统) 建立的索引；文件 mtime/size 变化或本进程保存后重建
+        self._index_stamp: Optional[Tuple[int, int]] = None
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_factory_system: Dict[Tuple[str, str], Dict[str, Any]] = {}
         self._init_config_file()
 
     def _init_config_file(self):
@@ -39,8 +44,27 @@ class ConfigManager:
         """从JSON文件加载数据"""
         return self._store.load()
 
+    def _config_index(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[Tuple[str, str], Dict[str, Any]]]:
+        """返回 (by_id, by_factory_system) 索引；同键多条时保留第一条，与顺序查找一致。"""
+        try:
+            st = os.stat(self.server_configs_file)
+            stamp: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp is None or stamp != self._index_stamp:
+            by_id: Dict[str, Dict[str, Any]] = {}
+            by_factory_system: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for config in self._load_configs():
+                by_id.setdefault(config.get('id'), config)
+                by_factory_system.setdefault((config.get('factory'), config.get('system')), config)
+            self._by_id = by_id
+            self._by_factory_system = by_factory_system
+            self._index_stamp = stamp
+        return self._by_id, self._by_factory_system
+
     def _save_configs(self, configs: List[Dict[str, Any]]) -> bool:
         """保存数据到JSON文件"""
+        self._index_stamp = None
         if self._store.save(configs):
             self.logger.info(f"配置保存成功: {self.server_configs_file}")
             return True
@@ -76,11 +100,13 @@ class ConfigManager:
 
     def get_config_by_id(self, config_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取配置"""
-        configs = self._load_configs()
-        for config in configs:
-            if config.get('id') == config_id:
-                return config
-        return None
+        config = self._config_index()[0].get(config_id)
+        return copy.deepcopy(config) if config is not None else None
+
+    def get_config_by_factory_system(self, factory: str, system: str) -> Optional[Dict[str, Any]]:
+        """根据厂区与系统获取配置"""
+        config = self._config_index()[1].get((factory, system))
+        return copy.deepcopy(config) if config is not None else None
 
     def add_server_config(self, factory: str, system: str, server: Dict[str, str]) -> Dict[str, Any]:
         """添加新的服务器配置 - 修复ID生成逻辑"""
@@ -4,14 +4,37 @@ from __future__ import annotations
 import copy
 import json
 import os
-import tempfile
 import threading
-from typing import Callable, Generic, Optional, TypeVar
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+try:  # 可选依赖：安装了 orjson 时用它编解码（快数倍），否则退回标准库 json
+    import orjson
+except ImportError:
+    orjson = None
 
 
 T = TypeVar("T")
 
 
+def write_atomic(filepath: str, data: bytes) -> None:
+    """写入同目录临时文件并 fsync 后再 os.replace 覆盖目标，中途失败或断电都不会留下半截文件。"""
+    # 临时文件名带进程/线程号，并发写同一目标互不踩踏；普通 open 保留默认权限
+    temp_path = f"{filepath}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(temp_path, "wb") as handle:
+            handle.write(data)
+            # 先落盘再改名：否则断电后 rename 可能已生效而数据还没写入，留下空文件或截断文件
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 class JsonStore(Generic[T]):
     """封装 JSON 文件的读写，带缓存、线程安全与原子写入。"""
 
@@ -22,8 +45,14 @@ class JsonStore(Generic[T]):
         *,
         encoding: str = "utf-8",
         enable_cache: bool = True,
+        pretty: bool = True,
     ) -> None:
         self.filepath = filepath
+        # 仅由程序读写的文件可关闭缩进，输出更小、编码更快
+        self._pretty = pretty
+        self._dump_kwargs = {"indent": 2} if pretty else {"separators": (",", ":")}
+        # orjson 只输出 UTF-8
+        self._use_orjson = orjson is not None and encoding.replace("-", "").lower() == "utf8"
         self._default_factory = default_factory
         self._encoding = encoding
         self._enable_cache = enable_cache
@@ -46,31 +75,30 @@ class JsonStore(Generic[T]):
             self._update_cache(data)
             return copy.deepcopy(data)
 
+    def peek(self) -> T:
+        """读取 JSON 数据但不拷贝，调用方只读不改；用于高频的单键查询。"""
+        with self._lock:
+            if self._enable_cache:
+                cached = self._try_load_from_cache()
+                if cached is not None:
+                    return cached
+
+            data = self._read_from_disk()
+            self._update_cache(data)
+            return self._cache
+
     def save(self, data: T) -> bool:
         """以原子方式写入 JSON 数据，并刷新缓存。"""
         payload = copy.deepcopy(data)
         with self._lock:
-            temp_path = None
             try:
-                dirpath = os.path.dirname(self.filepath) or "."
-                with tempfile.NamedTemporaryFile(
-                    mode="w",
-                    encoding=self._encoding,
-                    delete=False,
-                    dir=dirpath,
-                ) as handle:
-                    json.dump(payload, handle, ensure_ascii=False, indent=2)
-                    temp_path = handle.name
-                os.replace(temp_path, self.filepath)
-                self._update_cache(payload)
+                # 先整体编码再一次写入，json.dump 会按 token 多次调用 write
+                write_atomic(self.filepath, self._encode(payload))
+                # payload 已是独立副本，直接作为缓存，无需再拷贝一次
+                self._cache = payload
                 self._cache_mtime = self._safe_mtime()
                 return True
             except Exception:
-                if temp_path and os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
                 return False
 
     # ------------------------------------------------------------------ #
@@ -88,14 +116,27 @@ class JsonStore(Generic[T]):
         if not os.path.exists(self.filepath):
             return self._default_factory()
         try:
-            with open(self.filepath, "r", encoding=self._encoding) as handle:
-                data = json.load(handle)
-                if isinstance(data, self._data_type):
-                    return data
+            with open(self.filepath, "rb") as handle:
+                data = self._decode(handle.read())
+            if isinstance(data, self._data_type):
+                return data
         except Exception:
             pass
         return self._default_factory()
 
+    def _encode(self, payload: Any) -> bytes:
+        if self._use_orjson:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if self._pretty else 0)
+            except TypeError:
+                pass  # 非字符串键等 orjson 不支持的内容交给标准库
+        return json.dumps(payload, ensure_ascii=False, **self._dump_kwargs).encode(self._encoding)
+
+    def _decode(self, raw: bytes) -> Any:
+        if self._use_orjson:
+            return orjson.loads(raw)
+        return json.loads(raw.decode(self._encoding))
+
     def _update_cache(self, data: T) -> None:
         self._cache = copy.deepcopy(data)
         self._cache_mtime = self._safe_mtime()
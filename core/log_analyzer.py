@@ -3,13 +3,29 @@ import json
 import logging
 import os
 import re
+import sys
+import threading
+from collections import OrderedDict
 from time import perf_counter
 from typing import Any, Dict, List, Optional, Tuple
 
-from .log_parser import LogParser
+from .log_parser import LogEntry, LogParser
 from .report_generator import ReportGenerator
+from .json_store import write_atomic
 from .log_metadata_store import LogMetadataStore
 
+# 日志内容缓存上限：按行列表实际占用的内存累计（约为文件大小的 2 倍），不是文件字节数
+_LINE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 文本日志输出缓冲区大小
+_WRITE_BUFFER = 1 << 20
+
+# 文件名非法字符替换表
+_SAFE_TABLE = str.maketrans({c: '_' for c in '\\/*?:"<>|'})
+
+# tcp_trace.200 / tcp_trace.200.old / tcp_trace.500.l / tcp_trace_200 / tcptrace-200 等
+_NODE_FROM_PATH_RE = re.compile(r'tcp_?trace[._-](\d+)')
+
 
 class LogAnalyzer:
     def __init__(
@@ -26,6 +42,11 @@ class LogAnalyzer:
         self.logger = logging.getLogger(__name__)
         os.makedirs(output_dir, exist_ok=True)
         self.metadata_store = metadata_store
+        # (path, mtime_ns, size) -> lines；重复分析同一批日志时跳过磁盘读取
+        # 值为 (行列表, 其内存占用字节数)
+        self._line_cache: "OrderedDict[Tuple[str, int, int], Tuple[List[str], int]]" = OrderedDict()
+        self._line_cache_bytes = 0
+        self._line_cache_lock = threading.Lock()
 
     def analyze_logs(
         self,
@@ -41,6 +62,7 @@ class LogAnalyzer:
             'generate_html': True,
             'generate_original_log': True,
             'generate_sorted_log': True,
+            'compress_html': False,
         }
         if options:
             opts.update(options)
@@ -80,6 +102,9 @@ class LogAnalyzer:
             html_report_path = ''
             if opts.get('generate_html', True):
                 report_filename = self._generate_smart_filename(factory, system, log_paths, timestamp)
+                if opts.get('compress_html'):
+                    # .gz 结尾时报告边写边 gzip 压缩，体积约为原来的几分之一
+                    report_filename += '.gz'
                 html_report_path = os.path.join(self.output_dir, report_filename)
                 stage_start = perf_counter()
                 generated_html_path = report_generator.generate_html_logs(log_entries, html_report_path)
@@ -150,15 +175,14 @@ class LogAnalyzer:
         from datetime import datetime
         return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    def _generate_text_log(self, log_entries: List[Dict[str, Any]], prefix: str, timestamp: str) -> str:
+    def _generate_text_log(self, log_entries: List[LogEntry], prefix: str, timestamp: str) -> str:
         """生成文本日志文件"""
         try:
             filename = f"{prefix}_{timestamp}.log"
             file_path = os.path.join(self.output_dir, filename)
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for entry in log_entries:
-                    f.write(entry['parsed'] + '\n')
+            with open(file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+                f.writelines(entry.parsed + '\n' for entry in log_entries)
 
             self.logger.info(f"生成文本日志: {file_path}")
             return file_path
@@ -166,21 +190,20 @@ class LogAnalyzer:
             self.logger.error(f"生成文本日志失败: {str(e)}")
             return ""
 
-    def _generate_sorted_text_log(self, log_entries: List[Dict[str, Any]], prefix: str, timestamp: str) -> str:
+    def _generate_sorted_text_log(self, log_entries: List[LogEntry], prefix: str, timestamp: str) -> str:
         """生成排序后的文本日志文件"""
         try:
             # 按时间戳排序
             sorted_entries = sorted(
-                [entry for entry in log_entries if entry.get('timestamp')],
-                key=lambda x: x['timestamp']
+                [entry for entry in log_entries if entry.timestamp],
+                key=lambda x: x.timestamp
             )
 
             filename = f"{prefix}_{timestamp}.log"
             file_path = os.path.join(self.output_dir, filename)
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                for entry in sorted_entries:
-                    f.write(entry['parsed'] + '\n')
+            with open(file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+                f.writelines(entry.parsed + '\n' for entry in sorted_entries)
 
             self.logger.info(f"生成排序日志: {file_path}")
             return file_path
@@ -212,14 +235,38 @@ class LogAnalyzer:
                 self.logger.warning(f"日志文件不存在: {log_path}")
                 continue
             try:
-                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    file_lines = f.readlines()
-                    lines.extend(file_lines)
-                    read_files += 1
+                lines.extend(self._read_lines_cached(log_path))
+                read_files += 1
             except Exception as exc:
                 self.logger.error(f"读取日志文件失败: {log_path}, 错误: {exc}")
         return lines, read_files
 
+    def _read_lines_cached(self, log_path: str) -> List[str]:
+        """按 (路径, mtime, 大小) 缓存文件内容，文件变化后键自然失效。"""
+        st = os.stat(log_path)
+        key = (os.path.abspath(log_path), st.st_mtime_ns, st.st_size)
+        with self._line_cache_lock:
+            cached = self._line_cache.get(key)
+            if cached is not None:
+                self._line_cache.move_to_end(key)
+                return cached[0]
+
+        with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+            file_lines = f.readlines()
+
+        # str 对象头 + 内容通常是文件字节数的 2 倍左右，先按文件大小粗筛，过大的不必逐行计量
+        if st.st_size * 2 <= _LINE_CACHE_MAX_BYTES:
+            nbytes = sys.getsizeof(file_lines) + sum(map(sys.getsizeof, file_lines))
+            if nbytes <= _LINE_CACHE_MAX_BYTES:
+                with self._line_cache_lock:
+                    if key not in self._line_cache:
+                        self._line_cache[key] = (file_lines, nbytes)
+                        self._line_cache_bytes += nbytes
+                    while self._line_cache_bytes > _LINE_CACHE_MAX_BYTES:
+                        _, (_, old_bytes) = self._line_cache.popitem(last=False)
+                        self._line_cache_bytes -= old_bytes
+        return file_lines
+
     def _write_stats_record(
         self,
         factory: str,
@@ -249,8 +296,7 @@ class LogAnalyzer:
                         data = loaded
             data.append(record)
             data = data[-50:]
-            with open(stats_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            write_atomic(stats_path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
         except Exception as exc:
             self.logger.warning(f"写入分析统计失败: {exc}")
 
@@ -278,8 +324,8 @@ class LogAnalyzer:
             node_info = f"节点{sorted_nodes[0]}-{sorted_nodes[-1]}_共{len(sorted_nodes)}个"
 
         # 清理厂区和系统名称中的特殊字符
-        clean_factory = re.sub(r'[\\/*?:"<>|]', '_', factory)
-        clean_system = re.sub(r'[\\/*?:"<>|]', '_', system)
+        clean_factory = factory.translate(_SAFE_TABLE)
+        clean_system = system.translate(_SAFE_TABLE)
 
         return f"{analysis_type}_{clean_factory}_{clean_system}_{node_info}_{timestamp}.html"
 
@@ -288,21 +334,9 @@ class LogAnalyzer:
         try:
             filename = os.path.basename(log_path)
 
-            # 匹配常见的日志文件名格式
-            patterns = [
-                r'tcp_trace\.(\d+)',  # tcp_trace.200
-                r'tcp_trace\.(\d+)\.old',  # tcp_trace.200.old
-                r'tcp_trace\.(\d+)\.\d+',  # tcp_trace.200.12345
-                r'tcp_trace\.(\d+)\.l',  # tcp_trace.500.l (您遇到的格式)
-                r'tcp_trace\.(\d+)\.log',  # tcp_trace.200.log
-                r'tcp_trace_(\d+)',  # tcp_trace_200
-                r'tcp_?trace[._-](\d+)',  # 更通用的匹配
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, filename)
-                if match:
-                    return match.group(1)
+            match = _NODE_FROM_PATH_RE.search(filename)
+            if match:
+                return match.group(1)
 
             # 如果无法匹配，尝试从路径中提取
             path_parts = log_path.split(os.sep)
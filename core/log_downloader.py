@@ -1,16 +1,84 @@
 # core/log_downloader.py
+from __future__ import annotations
+
 import hashlib
 import logging
 import os
 import re
+import shlex
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache, partial
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-import paramiko
+if TYPE_CHECKING:
+    import paramiko
 
 from .log_metadata_store import LogMetadataStore
 
+# 单次下载任务中并行使用的 SFTP 通道数
+_DOWNLOAD_WORKERS = 4
+
+# 单个文件达到该大小且本次只下载这一个文件时，按字节区间拆到多个 SFTP 通道并行拉取
+_RANGED_MIN_SIZE = 64 * 1024 * 1024
+# 区间内每次 readv 请求的块大小
+_RANGED_CHUNK = 1024 * 1024
+
+# SFTP 通道接收窗口：默认 2 MiB 在高延迟链路上填不满带宽
+_SFTP_WINDOW_SIZE = 4 * 1024 * 1024
+
+# 归档检索时单条 stat 命令携带的路径数上限
+_STAT_BATCH = 200
+
+# 已下载列表中元数据文件数达到该值才并发读取；线程数上限
+_METADATA_PARALLEL_MIN = 4
+_METADATA_READ_WORKERS = 32
+
+# 连接池中空闲超过该秒数的 SSH 连接会在下次借用时关闭
+_SSH_IDLE_TTL = 300
+
+# 单条池连接上同时打开的通道（SFTP / exec）上限：OpenSSH 默认 MaxSessions 为 10，
+# 多个下载/搜索请求共用一条连接时超出会被拒绝（ChannelException）
+_SSH_MAX_CHANNELS = 8
+
+# 池中连接的 keepalive 间隔（秒）
+_SSH_KEEPALIVE = 30
+
+# 归档文件 stat 结果的缓存有效期（秒）；只缓存今天以前、且已找到的文件
+_ARCHIVE_STAT_TTL = 300
+
+_NODE_RE = re.compile(r"tcp_trace\.(\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+_STAT_SIZE_RE = re.compile(r"Size:\s*(\d+)")
+_STAT_MTIME_RE = re.compile(r"Modify:\s*(.+)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_ISO_RE = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2}:\d{2})")
+_ISO_SHORT_RE = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2})")
+
+
+@lru_cache(maxsize=1024)
+def _node_from_filename(filename: str) -> Optional[str]:
+    """从文件名解析节点号；批量下载时同名文件反复出现，结果做缓存。"""
+    # 绝大多数文件名形如 tcp_trace.<node>[.xxx]，先走字符串快路径
+    parts = filename.split(".")
+    if len(parts) >= 2 and parts[1].isdigit():
+        return parts[1]
+
+    m = _NODE_RE.search(filename)
+    if m:
+        return m.group(1)
+
+    digits = _DIGITS_RE.findall(filename)
+    if digits:
+        return max(digits, key=len)
+    return None
+
+
 class LogDownloader:
     """
     统一/增强版：
@@ -33,6 +101,21 @@ class LogDownloader:
         self.logger = logging.getLogger(__name__)
         os.makedirs(download_dir, exist_ok=True)
         self.metadata_store = metadata_store or LogMetadataStore(download_dir, metadata_dir)
+        # (hostname, username) -> SSHClient，搜索与下载共用同一条连接
+        self._ssh_pool: Dict[Tuple[str, str], paramiko.SSHClient] = {}
+        # 每条连接的借出计数与最后归还时间，用于回收空闲连接
+        self._ssh_borrowed: Dict[Tuple[str, str], int] = {}
+        self._ssh_last_used: Dict[Tuple[str, str], float] = {}
+        self._ssh_lock = threading.Lock()
+        # 池连接 -> 通道名额；临时新建、不入池的连接不受限
+        self._ssh_channels: "weakref.WeakKeyDictionary[paramiko.SSHClient, threading.BoundedSemaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # (hostname, remote_path) -> (缓存时间, (size, mtime))，重复检索同一日期范围时免去远端 stat
+        self._archive_stats: Dict[Tuple[str, str], Tuple[float, Tuple[int, str]]] = {}
+        self._archive_stats_lock = threading.Lock()
+        # 已确认支持 stat -c 的主机：批量 stat 无输出即代表文件都不存在
+        self._stat_c_hosts: Set[str] = set()
 
     # ---------------------- 对外：单节点（向后兼容） ----------------------
     def search_logs(
@@ -95,7 +178,8 @@ class LogDownloader:
                 if include_archive:
                     archive_path = (server_info.get("archive_path") or f"/nfs/{server_alias}/ips_log_archive/{server_alias}/km_log")
                     for it in self._search_archive_for_nodes(
-                        ssh, archive_path, nodes, date_start=date_start, date_end=date_end
+                        ssh, archive_path, nodes, date_start=date_start, date_end=date_end,
+                        hostname=server_info["hostname"],
                     ):
                         rp = it.get("remote_path") or it.get("path")
                         if rp and rp not in visited:
@@ -142,102 +226,234 @@ class LogDownloader:
         """
         支持传入逗号分隔字符串或可迭代对象；去空/去重/保持原顺序。
         """
-        out: List[str] = []
         if isinstance(nodes, str):
-            parts = [p.strip() for p in nodes.split(",")]
+            parts = (p.strip() for p in nodes.split(","))
         else:
-            parts = [str(p).strip() for p in list(nodes or [])]
-        for p in parts:
-            if not p:
-                continue
-            if p not in out:
-                out.append(p)
-        return out
+            parts = (str(p).strip() for p in (nodes or []))
+        # dict 保持插入顺序，去重为 O(n)
+        return list(dict.fromkeys(p for p in parts if p))
 
     def _get_server_config(self, factory: str, system: str) -> Optional[Dict[str, Any]]:
         """获取服务器配置"""
-        configs = self.config_manager.get_server_configs()
-        for config in configs:
-            if config.get("factory") == factory and config.get("system") == system:
-                return config
-        return None
+        return self.config_manager.get_config_by_factory_system(factory, system)
 
     @contextmanager
     def _open_ssh(self, server_info: Dict[str, Any]):
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        ssh.connect(
-            server_info["hostname"],
-            username=server_info["username"],
-            password=server_info["password"],
-            timeout=int(server_info.get("timeout", 30)),
-        )
+        """借出连接池中的 SSHClient；用完不关闭，供后续搜索/下载复用。"""
+        key = (server_info["hostname"], server_info["username"])
+        ssh = self._get_ssh(server_info)
         try:
             yield ssh
+        except Exception:
+            transport = ssh.get_transport()
+            if transport is None or not transport.is_active():
+                self._discard_ssh(server_info, ssh)
+            raise
         finally:
-            try:
-                ssh.close()
-            except Exception:
-                pass
+            with self._ssh_lock:
+                if self._ssh_pool.get(key) is ssh:
+                    self._ssh_borrowed[key] = max(0, self._ssh_borrowed.get(key, 1) - 1)
+                    self._ssh_last_used[key] = monotonic()
+
+    def _get_ssh(self, server_info: Dict[str, Any]) -> paramiko.SSHClient:
+        key = (server_info["hostname"], server_info["username"])
+        with self._ssh_lock:
+            stale = self._reap_idle_locked(exclude=key)
+            ssh = self._ssh_pool.get(key)
+            if ssh is not None and self._is_active(ssh):
+                self._ssh_borrowed[key] = self._ssh_borrowed.get(key, 0) + 1
+            else:
+                if ssh is not None:
+                    stale.append(self._pop_locked(key))
+                ssh = None
+        for client in stale:
+            self._close_quietly(client)
+        if ssh is not None:
+            return ssh
+
+        # 握手可能很慢（甚至等满超时），不能占着全局锁，否则其它主机的借还都会被卡住
+        ssh = self._connect(server_info)
+        with self._ssh_lock:
+            pooled = self._ssh_pool.get(key)
+            if pooled is not None and self._is_active(pooled):
+                # 其它线程已先建好同一主机的连接：用它的，关掉自己这条
+                self._ssh_borrowed[key] = self._ssh_borrowed.get(key, 0) + 1
+                stale, ssh = ssh, pooled
+            else:
+                stale = self._pop_locked(key) if pooled is not None else None
+                self._ssh_pool[key] = ssh
+                self._ssh_borrowed[key] = 1
+                self._ssh_channels[ssh] = threading.BoundedSemaphore(_SSH_MAX_CHANNELS)
+        self._close_quietly(stale)
+        return ssh
+
+    def _connect(self, server_info: Dict[str, Any]) -> paramiko.SSHClient:
+        # paramiko（连带 cryptography）导入较慢，推迟到第一次真正建连时
+        import paramiko
+
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            # 日志是文本，默认开启传输层 zlib 压缩；服务器配置 compress=false 可关闭
+            ssh.connect(
+                server_info["hostname"],
+                username=server_info["username"],
+                password=server_info["password"],
+                timeout=int(server_info.get("timeout", 30)),
+                compress=self._config_flag(server_info.get("compress"), default=True),
+            )
+        except Exception:
+            self._close_quietly(ssh)
+            raise
+        # 池中连接可能长时间空闲，定期发 keepalive 防止被 NAT/防火墙静默断开
+        transport = ssh.get_transport()
+        if transport is not None:
+            transport.set_keepalive(_SSH_KEEPALIVE)
+        return ssh
+
+    @staticmethod
+    def _config_flag(value: Any, default: bool) -> bool:
+        """配置里的开关可能写成 bool、数字或 "false"/"0" 这类字符串。"""
+        if isinstance(value, str):
+            value = value.strip().lower()
+            if not value:
+                return default
+            return value not in ("0", "false", "no", "off")
+        if value is None:
+            return default
+        return bool(value)
+
+    @staticmethod
+    def _is_active(ssh: paramiko.SSHClient) -> bool:
+        transport = ssh.get_transport()
+        return transport is not None and transport.is_active()
+
+    def _reap_idle_locked(self, exclude: Tuple[str, str]) -> List[paramiko.SSHClient]:
+        """从池中摘下未被借出且空闲超过 _SSH_IDLE_TTL 的连接（调用方持有 _ssh_lock），由调用方在锁外关闭。"""
+        now = monotonic()
+        idle = []
+        for key in list(self._ssh_pool):
+            if key == exclude or self._ssh_borrowed.get(key, 0) > 0:
+                continue
+            if now - self._ssh_last_used.get(key, now) > _SSH_IDLE_TTL:
+                idle.append(self._pop_locked(key))
+        return idle
+
+    def _pop_locked(self, key: Tuple[str, str]) -> Optional[paramiko.SSHClient]:
+        self._ssh_borrowed.pop(key, None)
+        self._ssh_last_used.pop(key, None)
+        return self._ssh_pool.pop(key, None)
+
+    def _discard_ssh(self, server_info: Dict[str, Any], ssh: paramiko.SSHClient) -> None:
+        key = (server_info["hostname"], server_info["username"])
+        with self._ssh_lock:
+            if self._ssh_pool.get(key) is ssh:
+                self._pop_locked(key)
+        self._close_quietly(ssh)
+
+    def close(self) -> None:
+        """关闭连接池中的全部 SSH 连接。"""
+        with self._ssh_lock:
+            clients = list(self._ssh_pool.values())
+            self._ssh_pool.clear()
+            self._ssh_borrowed.clear()
+            self._ssh_last_used.clear()
+        for ssh in clients:
+            self._close_quietly(ssh)
+
+    @staticmethod
+    def _close_quietly(ssh: Optional[paramiko.SSHClient]) -> None:
+        if ssh is None:
+            return
+        try:
+            ssh.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def _channel_slot(self, ssh: paramiko.SSHClient):
+        """占用池连接的一个通道名额，直到通道关闭；名额用完时等待其它请求释放。"""
+        with self._ssh_lock:
+            slot = self._ssh_channels.get(ssh)
+        if slot is None:
+            yield
+        else:
+            with slot:
+                yield
 
     @contextmanager
     def _open_sftp(self, ssh: paramiko.SSHClient):
+        import paramiko
+
         sftp = None
-        try:
-            sftp = ssh.open_sftp()
-            yield sftp
-        finally:
-            if sftp:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
+        with self._channel_slot(ssh):
+            try:
+                sftp = paramiko.SFTPClient.from_transport(
+                    ssh.get_transport(), window_size=_SFTP_WINDOW_SIZE
+                )
+                yield sftp
+            finally:
+                if sftp:
+                    try:
+                        sftp.close()
+                    except Exception:
+                        pass
 
     # ====================== 内部：实时/归档检索 ======================
     def _search_realtime_for_nodes(
         self, ssh: paramiko.SSHClient, base_path: str, nodes: Iterable[str]
     ) -> List[Dict[str, Any]]:
         """
-        遍历节点，执行 ls -l {base_path}/tcp_trace.{node}*
+        所有节点的 tcp_trace.{node}* 合并成一条 ls -l，整批只走一次远端往返。
         修复返回 remote_path，补充 node 字段。
         """
         results: List[Dict[str, Any]] = []
-        for node in nodes or []:
-            try:
-                cmd = f'ls -l {base_path}/tcp_trace.{node}* 2>/dev/null'
-                stdin, stdout, stderr = ssh.exec_command(cmd)
+        nodes = [str(node) for node in nodes or []]
+        if not nodes:
+            return results
+        exact = [(node, f"tcp_trace.{node}", f"tcp_trace.{node}.") for node in nodes]
+        try:
+            patterns = " ".join(f"{base_path}/tcp_trace.{node}*" for node in nodes)
+            with self._channel_slot(ssh):
+                stdin, stdout, stderr = ssh.exec_command(f"ls -l {patterns} 2>/dev/null")
                 lines = stdout.read().decode(errors="ignore").splitlines()
+        except Exception as e:
+            self.logger.error(f"搜索实时日志失败（nodes={','.join(nodes)}）: {str(e)}")
+            return results
 
-                for line in lines:
-                    line = line.strip()
-                    if not line or line.startswith("total"):
-                        continue
-                    parts = line.split()
-                    if len(parts) < 9:
-                        continue
-
-                    size = parts[4]
-                    # mtime 形如 "Jan 01 12:34" 或 "2025-01-01 12:34"
-                    mtime = " ".join(parts[5:8])
-                    filename = " ".join(parts[8:])
-
-                    # 兼容 ls 可能返回绝对路径或仅文件名
-                    basename = os.path.basename(filename)
-                    remote_path = f"{base_path.rstrip('/')}/{basename}"
-
-                    item = {
-                        "name": basename,
-                        "remote_path": remote_path,
-                        "path": remote_path,  # 兼容旧字段
-                        "size": int(size) if str(size).isdigit() else 0,
-                        "mtime": self._format_timestamp(mtime),
-                        "type": "realtime",
-                        "node": self._extract_node_from_filename(basename),
-                    }
-                    results.append(item)
-            except Exception as e:
-                self.logger.error(f"搜索实时日志失败（node={node}）: {str(e)}")
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("total"):
+                continue
+            parts = line.split()
+            if len(parts) < 9:
                 continue
+
+            size = parts[4]
+            # mtime 形如 "Jan 01 12:34" 或 "2025-01-01 12:34"
+            mtime = " ".join(parts[5:8])
+            filename = " ".join(parts[8:])
+
+            # 兼容 ls 可能返回绝对路径或仅文件名
+            basename = os.path.basename(filename)
+            remote_path = f"{base_path.rstrip('/')}/{basename}"
+            # 通配符 tcp_trace.{node}* 也会命中 tcp_trace.{node}1 等，只有精确前缀才能直接用检索节点
+            item_node = next(
+                (node for node, name, prefix in exact if basename == name or basename.startswith(prefix)),
+                None,
+            )
+            if item_node is None:
+                item_node = self._extract_node_from_filename(basename)
+
+            results.append({
+                "name": basename,
+                "remote_path": remote_path,
+                "path": remote_path,  # 兼容旧字段
+                "size": int(size) if str(size).isdigit() else 0,
+                "mtime": self._format_timestamp(mtime),
+                "type": "realtime",
+                "node": item_node,
+            })
         return results
 
     def _search_archive_for_nodes(
@@ -247,9 +463,11 @@ class LogDownloader:
         nodes: Iterable[str],
         date_start: Optional[str],
         date_end: Optional[str],
+        hostname: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         归档按日期范围与节点枚举；stat 使用完整路径。
+        传入 hostname 时，今天以前的已归档文件 stat 结果会缓存 _ARCHIVE_STAT_TTL 秒。
         """
         results: List[Dict[str, Any]] = []
 
@@ -271,38 +489,127 @@ class LogDownloader:
             date_list.append(cur.strftime("%Y-%m-%d"))
             cur += timedelta(days=1)
 
+        candidates = []
         for node in nodes or []:
             for date_str in date_list:
-                try:
-                    basename = f"tcp_trace.{node}.{date_str}"
-                    remote_path = f"{base_path.rstrip('/')}/{basename}"
+                basename = f"tcp_trace.{node}.{date_str}"
+                candidates.append((str(node), date_str, basename, f"{base_path.rstrip('/')}/{basename}"))
 
-                    # stat 需要完整路径
-                    cmd = f"stat {remote_path} 2>/dev/null"
-                    stdin, stdout, stderr = ssh.exec_command(cmd)
-                    stat_info = stdout.read().decode().strip()
+        today = datetime.now().strftime("%Y-%m-%d")
+        stats = self._cached_archive_stats(hostname, candidates, today)
+        pending = [c for c in candidates if c[3] not in stats]
+
+        # 一次 stat -c 取回全部候选文件的大小与修改时间；不支持 -c 时逐个 stat
+        fresh = (
+            self._stat_many(ssh, [c[3] for c in pending], supported=hostname in self._stat_c_hosts)
+            if pending else {}
+        )
+        if fresh and hostname:
+            self._stat_c_hosts.add(hostname)
+        if fresh is None:
+            fresh = {}
+            for node, date_str, _, remote_path in pending:
+                try:
+                    stat_info = self._exec_read(ssh, f"stat {shlex.quote(remote_path)} 2>/dev/null").strip()
                     if not stat_info:
                         continue
-
-                    size_match = re.search(r"Size:\s*(\d+)", stat_info)
-                    mtime_match = re.search(r"Modify:\s*(.+)", stat_info)
-
-                    item = {
-                        "name": basename,
-                        "remote_path": remote_path,
-                        "path": remote_path,  # 兼容旧字段
-                        "size": int(size_match.group(1)) if size_match else 0,
-                        "mtime": self._format_timestamp(mtime_match.group(1) if mtime_match else ""),
-                        "type": "archive",
-                        "node": self._extract_node_from_filename(basename),
-                    }
-                    results.append(item)
+                    size_match = _STAT_SIZE_RE.search(stat_info)
+                    mtime_match = _STAT_MTIME_RE.search(stat_info)
+                    fresh[remote_path] = (
+                        int(size_match.group(1)) if size_match else 0,
+                        mtime_match.group(1) if mtime_match else "",
+                    )
                 except Exception as e:
                     self.logger.error(f"搜索归档日志失败（node={node}, date={date_str}）: {str(e)}")
-                    continue
+        stats.update(fresh)
+        self._store_archive_stats(hostname, pending, fresh, today)
+
+        for node, _, basename, remote_path in candidates:
+            found = stats.get(remote_path)
+            if found is None:
+                continue
+            size, mtime_raw = found
+            results.append({
+                "name": basename,
+                "remote_path": remote_path,
+                "path": remote_path,  # 兼容旧字段
+                "size": size,
+                "mtime": self._format_timestamp(mtime_raw),
+                "type": "archive",
+                "node": node,
+            })
 
         return results
 
+    def _cached_archive_stats(
+        self,
+        hostname: Optional[str],
+        candidates: List[Tuple[str, str, str, str]],
+        today: str,
+    ) -> Dict[str, Tuple[int, str]]:
+        if not hostname:
+            return {}
+        now = monotonic()
+        found: Dict[str, Tuple[int, str]] = {}
+        with self._archive_stats_lock:
+            for _, date_str, _, remote_path in candidates:
+                if date_str >= today:
+                    continue
+                cached = self._archive_stats.get((hostname, remote_path))
+                if cached is not None and now - cached[0] <= _ARCHIVE_STAT_TTL:
+                    found[remote_path] = cached[1]
+        return found
+
+    def _store_archive_stats(
+        self,
+        hostname: Optional[str],
+        candidates: List[Tuple[str, str, str, str]],
+        stats: Dict[str, Tuple[int, str]],
+        today: str,
+    ) -> None:
+        # 当天的归档可能仍在写入，未找到的文件之后可能才归档，二者都不缓存
+        if not hostname:
+            return
+        now = monotonic()
+        with self._archive_stats_lock:
+            for key, (stamp, _) in list(self._archive_stats.items()):
+                if now - stamp > _ARCHIVE_STAT_TTL:
+                    del self._archive_stats[key]
+            for _, date_str, _, remote_path in candidates:
+                if date_str < today and remote_path in stats:
+                    self._archive_stats[(hostname, remote_path)] = (now, stats[remote_path])
+
+    def _stat_many(
+        self, ssh: paramiko.SSHClient, paths: List[str], supported: bool = False
+    ) -> Optional[Dict[str, Tuple[int, str]]]:
+        """批量 stat：返回 path -> (size, mtime)；远端不支持 stat -c 时返回 None。
+
+        supported 为 True 表示已确认远端支持 stat -c，无输出即视为文件都不存在。
+        """
+        found: Dict[str, Tuple[int, str]] = {}
+        for i in range(0, len(paths), _STAT_BATCH):
+            batch = paths[i:i + _STAT_BATCH]
+            cmd = "stat -c '%n|%s|%y' " + " ".join(shlex.quote(p) for p in batch) + " 2>/dev/null"
+            try:
+                output = self._exec_read(ssh, cmd)
+            except Exception as e:
+                self.logger.error(f"批量 stat 失败: {str(e)}")
+                return None
+            for line in output.splitlines():
+                parts = line.split("|", 2)
+                if len(parts) != 3 or not parts[1].isdigit():
+                    return None
+                found[parts[0]] = (int(parts[1]), parts[2].strip())
+        if not found and paths and not supported:
+            # 全部不存在与不支持 -c 无法区分，交给逐个 stat 确认
+            return None
+        return found
+
+    def _exec_read(self, ssh: paramiko.SSHClient, cmd: str) -> str:
+        with self._channel_slot(ssh):
+            stdin, stdout, stderr = ssh.exec_command(cmd)
+            return stdout.read().decode()
+
     # ====================== 下载 ======================
     def download_logs(
         self,
@@ -327,7 +634,6 @@ class LogDownloader:
             download_base_dir = os.path.join(self.download_dir, factory, system)
             os.makedirs(download_base_dir, exist_ok=True)
 
-            downloaded_files: List[Dict[str, Any]] = []
             node_groups = self._group_files_by_node(log_files)
             if not node_groups:
                 return []
@@ -336,60 +642,218 @@ class LogDownloader:
             search_nodes_payload = normalized_search_nodes or ([search_node] if search_node else [])
             search_trace = search_node or ",".join(normalized_search_nodes)
 
+            jobs: List[Dict[str, Any]] = []
+            for actual_node, node_files in node_groups.items():
+                node_dir = os.path.join(download_base_dir, actual_node)
+                os.makedirs(node_dir, exist_ok=True)
+                for file_info in node_files:
+                    local_path = os.path.join(node_dir, file_info["name"])
+                    jobs.append({**file_info, "node": actual_node, "local_path": local_path})
+
+            context = {
+                "factory": factory,
+                "system": system,
+                "search_node": search_node,
+                "search_nodes": search_nodes_payload,
+                "search_trace": search_trace,
+            }
+            # 同一 SSH 连接上开多个 SFTP 通道并行拉取，避免逐个文件串行等待往返
+            workers = max(1, min(_DOWNLOAD_WORKERS, len(jobs)))
+            slots: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
             server_info = server_config["server"]
             with self._open_ssh(server_info) as ssh:
-                with self._open_sftp(ssh) as sftp:
-                    for actual_node, node_files in node_groups.items():
-                        node_dir = os.path.join(download_base_dir, actual_node)
-                        os.makedirs(node_dir, exist_ok=True)
-
-                        for file_info in node_files:
-                            remote_path = file_info["remote_path"]
-                            filename = file_info["name"]
-                            local_path = os.path.join(node_dir, filename)
-
-                            try:
-                                sftp.get(remote_path, local_path)
-                                download_time = datetime.now().isoformat()
-                                source_mtime = file_info.get("mtime") or ""
-                                entry = {
-                                    "name": filename,
-                                    "path": local_path,
-                                    "size": os.path.getsize(local_path),
-                                    "timestamp": download_time,
-                                    "download_time": download_time,
-                                    "log_time": source_mtime,
-                                    "source_mtime": source_mtime,
-                                    "factory": factory,
-                                    "system": system,
-                                    "node": actual_node,
-                                    "type": file_info.get("type", "unknown"),
-                                    "search_node": search_node,
-                                    "search_nodes": search_nodes_payload,
-                                }
-                                downloaded_files.append(entry)
-                                self._write_metadata(
-                                    local_path,
-                                    {
-                                        **entry,
-                                        "remote_path": remote_path,
-                                    },
-                                )
-                                self.logger.info(
-                                    "成功下载: %s (实际节点: %s, 搜索节点/集: %s)",
-                                    local_path,
-                                    actual_node,
-                                    search_trace or "未指定",
-                                )
-                            except Exception as e:
-                                self.logger.error(f"下载失败 {remote_path}: {str(e)}")
-                                continue
-
-            return downloaded_files
+                if len(jobs) == 1 and self._as_int(jobs[0].get("size")) >= _RANGED_MIN_SIZE:
+                    # 只有一个大文件时，多通道按区间并行拉取同一个文件；失败再整文件重试一次
+                    slots[0] = self._download_one(jobs[0], context, partial(self._fetch_ranged, ssh))
+                    pending = deque([] if slots[0] else [0])
+                else:
+                    # 各通道从同一队列取文件：某个通道打不开或中途断开，剩下的文件由其它通道接着下
+                    pending = deque(range(len(jobs)))
+
+                    def _worker(_: int) -> None:
+                        try:
+                            with self._open_sftp(ssh) as sftp:
+                                fetch = partial(self._fetch_whole, sftp)
+                                while True:
+                                    try:
+                                        idx = pending.popleft()
+                                    except IndexError:
+                                        return
+                                    slots[idx] = self._download_one(jobs[idx], context, fetch)
+                                    if slots[idx] is None and not self._sftp_alive(sftp):
+                                        # 失败源于通道断开而非文件本身：交还队列，本通道退出
+                                        pending.appendleft(idx)
+                                        return
+                        except Exception as e:
+                            self.logger.error(f"打开 SFTP 通道失败: {str(e)}")
+
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        list(pool.map(_worker, range(workers)))
+
+                if pending:
+                    self._download_serial(server_info, ssh, jobs, list(pending), context, slots)
+
+            return [entry for entry in slots if entry]
         except Exception as e:
             self.logger.error(f"下载日志失败: {str(e)}")
             return []
 
+    def _download_serial(
+        self,
+        server_info: Dict[str, Any],
+        ssh: paramiko.SSHClient,
+        jobs: List[Dict[str, Any]],
+        indices: List[int],
+        context: Dict[str, Any],
+        slots: List[Optional[Dict[str, Any]]],
+    ) -> None:
+        """并行阶段没能完成的文件逐个重试：先在池连接上另开通道，不行再临时新建一条连接。"""
+        for client in (ssh, None):
+            owned = None
+            try:
+                if client is None:
+                    owned = client = self._connect(server_info)
+                with self._open_sftp(client) as sftp:
+                    fetch = partial(self._fetch_whole, sftp)
+                    while indices:
+                        idx = indices[0]
+                        slots[idx] = self._download_one(jobs[idx], context, fetch)
+                        if slots[idx] is None and not self._sftp_alive(sftp):
+                            break
+                        indices.pop(0)
+            except Exception as e:
+                self.logger.error(f"打开 SFTP 通道失败: {str(e)}")
+            finally:
+                self._close_quietly(owned)
+            if not indices:
+                return
+        for idx in indices:
+            self.logger.error(f"下载失败 {jobs[idx]['remote_path']}: 没有可用的 SFTP 通道")
+
+    @staticmethod
+    def _sftp_alive(sftp: paramiko.SFTPClient) -> bool:
+        try:
+            channel = sftp.get_channel()
+            return channel is not None and not channel.closed
+        except Exception:
+            return False
+
+    def _download_one(
+        self,
+        job: Dict[str, Any],
+        context: Dict[str, Any],
+        fetch: Callable[[str, str], int],
+    ) -> Optional[Dict[str, Any]]:
+        remote_path = job["remote_path"]
+        filename = job["name"]
+        local_path = job["local_path"]
+        actual_node = job["node"]
+        try:
+            source_mtime = job.get("mtime") or ""
+            cached = self._up_to_date_metadata(job)
+            if cached is not None:
+                # 本地副本与远端大小、修改时间一致，沿用已下载文件
+                size = self._as_int(job.get("size"))
+                download_time = cached.get("download_time") or datetime.now().isoformat()
+            else:
+                # fetch 返回写入字节数，直接作为 size，免去下载后再 stat 一次
+                size = fetch(remote_path, local_path)
+                download_time = datetime.now().isoformat()
+            entry = {
+                "name": filename,
+                "path": local_path,
+                "size": size,
+                "timestamp": download_time,
+                "download_time": download_time,
+                "log_time": source_mtime,
+                "source_mtime": source_mtime,
+                "factory": context["factory"],
+                "system": context["system"],
+                "node": actual_node,
+                "type": job.get("type", "unknown"),
+                "search_node": context["search_node"],
+                "search_nodes": context["search_nodes"],
+            }
+            self._write_metadata(
+                local_path,
+                {
+                    **entry,
+                    "remote_path": remote_path,
+                },
+            )
+            self.logger.info(
+                "%s: %s (实际节点: %s, 搜索节点/集: %s)",
+                "已是最新，跳过下载" if cached is not None else "成功下载",
+                local_path,
+                actual_node,
+                context["search_trace"] or "未指定",
+            )
+            return entry
+        except Exception as e:
+            self.logger.error(f"下载失败 {remote_path}: {str(e)}")
+            return None
+
+    def _up_to_date_metadata(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """本地已有同一远端文件、且大小与修改时间都与检索结果一致时返回其元数据，否则返回 None。"""
+        size = self._as_int(job.get("size"))
+        mtime = job.get("mtime") or ""
+        if size <= 0 or not mtime:
+            return None
+        try:
+            if os.path.getsize(job["local_path"]) != size:
+                return None
+        except OSError:
+            return None
+        metadata = self._read_metadata(job["local_path"])
+        if metadata.get("remote_path") != job["remote_path"] or metadata.get("source_mtime") != mtime:
+            return None
+        return metadata
+
+    @staticmethod
+    def _fetch_whole(sftp: paramiko.SFTPClient, remote_path: str, local_path: str) -> int:
+        with open(local_path, "wb") as handle:
+            return sftp.getfo(remote_path, handle)
+
+    def _fetch_ranged(self, ssh: paramiko.SSHClient, remote_path: str, local_path: str) -> int:
+        """把文件按字节区间拆给 _DOWNLOAD_WORKERS 个 SFTP 通道并行读取，各自写入本地文件的对应位置。"""
+        with self._open_sftp(ssh) as sftp:
+            size = sftp.stat(remote_path).st_size or 0
+            if size < _RANGED_MIN_SIZE:
+                return self._fetch_whole(sftp, remote_path, local_path)
+
+        # 先按远端大小预分配，各区间再以独立句柄 seek 后写入（Windows 无 os.pwrite）
+        with open(local_path, "wb") as handle:
+            handle.truncate(size)
+        step = -(-size // _DOWNLOAD_WORKERS)
+        ranges = [(start, min(start + step, size)) for start in range(0, size, step)]
+
+        def _part(bounds: Tuple[int, int]) -> int:
+            start, end = bounds
+            chunks = [(pos, min(_RANGED_CHUNK, end - pos)) for pos in range(start, end, _RANGED_CHUNK)]
+            written = 0
+            with self._open_sftp(ssh) as sftp, sftp.open(remote_path, "rb") as remote, \
+                    open(local_path, "r+b") as local:
+                local.seek(start)
+                # readv 一次性发出全部块请求，按顺序返回数据
+                for data in remote.readv(chunks):
+                    local.write(data)
+                    written += len(data)
+            return written
+
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            total = sum(pool.map(_part, ranges))
+        if total != size:
+            raise IOError(f"分段下载大小不一致: {total} != {size}")
+        return size
+
+    @staticmethod
+    def _as_int(value: Any) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+
     # ====================== 辅助 ======================
     def _group_files_by_node(self, log_files: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         node_groups: Dict[str, List[Dict[str, Any]]] = {}
@@ -408,23 +872,9 @@ class LogDownloader:
     def _extract_node_from_filename(self, filename: str) -> str:
         """从文件名中提取节点号 - 增强版"""
         try:
-            patterns = [
-                r"tcp_trace\.(\d+)",
-                r"tcp_trace\.(\d+)\.old",
-                r"tcp_trace\.(\d+)\.\d{4}-\d{2}-\d{2}",
-            ]
-            for pattern in patterns:
-                m = re.search(pattern, filename)
-                if m:
-                    return m.group(1)
-
-            parts = filename.split(".")
-            if len(parts) >= 2 and parts[1].isdigit():
-                return parts[1]
-
-            digits = re.findall(r"\d+", filename)
-            if digits:
-                return max(digits, key=len)
+            node = _node_from_filename(filename)
+            if node:
+                return node
 
             self.logger.warning(f"无法从文件名提取节点号: {filename}, 使用'未知'")
             return "未知"
@@ -445,15 +895,22 @@ class LogDownloader:
             self.logger.warning("读取日志元数据失败: %s (%s)", file_path, exc)
             return {}
 
+    def _read_metadata_many(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        if len(file_paths) < _METADATA_PARALLEL_MIN:
+            return [self._read_metadata(path) for path in file_paths]
+        workers = min(_METADATA_READ_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._read_metadata, file_paths))
+
     def _format_timestamp(self, raw: str) -> str:
         text = (raw or "").strip()
         if not text:
             return ""
-        normalized = re.sub(r"\s+", " ", text)
-        iso_match = re.match(r"(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2}:\d{2})", normalized)
+        normalized = _WHITESPACE_RE.sub(" ", text)
+        iso_match = _ISO_RE.match(normalized)
         if iso_match:
             return f"{iso_match.group('date')} {iso_match.group('time')}"
-        iso_short = re.match(r"(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2})", normalized)
+        iso_short = _ISO_SHORT_RE.match(normalized)
         if iso_short:
             return f"{iso_short.group('date')} {iso_short.group('time')}:00"
 
@@ -470,10 +927,6 @@ class LogDownloader:
         except Exception:
             pass
 
-        frac_iso = re.match(r"(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2}:\d{2})\.\d+", normalized)
-        if frac_iso:
-            return f"{frac_iso.group('date')} {frac_iso.group('time')}"
-
         return normalized
 
     def get_downloaded_logs(self) -> List[Dict[str, Any]]:
@@ -485,57 +938,66 @@ class LogDownloader:
             if not os.path.exists(self.download_dir):
                 return []
 
-            for root, dirs, files in os.walk(self.download_dir):
+            # 以绝对路径遍历，root 已是绝对路径，单个文件无需再 abspath/relpath
+            base_dir = os.path.abspath(self.download_dir)
+            base_len = len(base_dir)
+            found: List[Tuple[str, str, List[str]]] = []
+            for root, dirs, files in os.walk(base_dir):
+                rel_dir = root[base_len:].lstrip(os.sep)
+                dir_parts = rel_dir.split(os.sep) if rel_dir else []
                 for file in files:
                     if not file.startswith("tcp_trace"):
                         continue
-                    file_path = os.path.abspath(os.path.join(root, file))
+                    file_path = os.path.join(root, file)
                     if file_path in seen_files:
                         continue
                     seen_files.add(file_path)
-
-                    relative_path = os.path.relpath(file_path, self.download_dir)
-                    parts = relative_path.split(os.sep)
-
-                    if len(parts) >= 3:
-                        factory, system, actual_node = parts[:3]
-                    else:
-                        factory, system = "未知厂区", "未知系统"
-                        actual_node = self._extract_node_from_filename(file)
-
-                    file_id = hashlib.md5(file_path.encode()).hexdigest()[:8]
-
-                    metadata = self._read_metadata(file_path)
-                    factory = metadata.get("factory") or factory
-                    system = metadata.get("system") or system
-                    actual_node = metadata.get("node") or actual_node
-                    download_time = (
-                        metadata.get("download_time")
-                        or metadata.get("timestamp")
-                        or datetime.fromtimestamp(os.path.getctime(file_path)).isoformat()
-                    )
-                    log_time = (
-                        metadata.get("log_time")
-                        or metadata.get("source_mtime")
-                        or metadata.get("remote_mtime")
-                        or ""
-                    )
-
-                    downloaded_logs.append(
-                        {
-                            "id": file_id,
-                            "path": file_path,
-                            "name": file,
-                            "factory": factory,
-                            "system": system,
-                            "node": actual_node,
-                            "timestamp": download_time,
-                            "download_time": download_time,
-                            "log_time": log_time,
-                            "source_mtime": log_time,
-                            "size": os.path.getsize(file_path),
-                        }
-                    )
+                    found.append((file_path, file, dir_parts))
+
+            # 先收集文件再批量读取元数据，文件多时并发读取 sidecar
+            metadata_list = self._read_metadata_many([item[0] for item in found])
+            for (file_path, file, dir_parts), metadata in zip(found, metadata_list):
+                parts = dir_parts + [file]
+
+                if len(parts) >= 3:
+                    factory, system, actual_node = parts[:3]
+                else:
+                    factory, system = "未知厂区", "未知系统"
+                    actual_node = self._extract_node_from_filename(file)
+
+                file_id = hashlib.md5(file_path.encode()).hexdigest()[:8]
+
+                stat = os.stat(file_path)
+                factory = metadata.get("factory") or factory
+                system = metadata.get("system") or system
+                actual_node = metadata.get("node") or actual_node
+                download_time = (
+                    metadata.get("download_time")
+                    or metadata.get("timestamp")
+                    or datetime.fromtimestamp(stat.st_ctime).isoformat()
+                )
+                log_time = (
+                    metadata.get("log_time")
+                    or metadata.get("source_mtime")
+                    or metadata.get("remote_mtime")
+                    or ""
+                )
+
+                downloaded_logs.append(
+                    {
+                        "id": file_id,
+                        "path": file_path,
+                        "name": file,
+                        "factory": factory,
+                        "system": system,
+                        "node": actual_node,
+                        "timestamp": download_time,
+                        "download_time": download_time,
+                        "log_time": log_time,
+                        "source_mtime": log_time,
+                        "size": stat.st_size,
+                    }
+                )
 
             downloaded_logs.sort(key=lambda x: x.get("download_time") or x.get("timestamp"), reverse=True)
             self.logger.info(f"获取已下载日志完成，共{len(downloaded_logs)}个文件")
@@ -3,7 +3,10 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .json_store import write_atomic
 
 
 class LogMetadataStore:
@@ -13,6 +16,9 @@ class LogMetadataStore:
         self.download_dir = os.path.abspath(download_dir)
         self.metadata_dir = os.path.abspath(metadata_dir or download_dir)
         os.makedirs(self.metadata_dir, exist_ok=True)
+        # meta_path -> ((mtime_ns, size), data); listing the downloads re-reads every sidecar
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
 
     # ------------------------------------------------------------------
     def path_for(self, log_path: str, *, ensure_dir: bool = True) -> str:
@@ -37,26 +43,45 @@ class LogMetadataStore:
             candidates.append(legacy)
 
         for meta_path in candidates:
-            if not meta_path or not os.path.exists(meta_path):
+            if not meta_path:
+                continue
+            try:
+                st = os.stat(meta_path)
+            except OSError:
                 continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            with self._lock:
+                cached = self._cache.get(meta_path)
+            if cached is not None and cached[0] == stamp:
+                return dict(cached[1])
             try:
                 with open(meta_path, "r", encoding="utf-8") as handle:
                     data = json.load(handle)
-                    return data if isinstance(data, dict) else {}
             except Exception:
                 continue
+            if not isinstance(data, dict):
+                data = {}
+            with self._lock:
+                self._cache[meta_path] = (stamp, data)
+            return dict(data)
         return {}
 
     def write(self, log_path: str, payload: Dict[str, Any]) -> None:
         meta_path = self.path_for(log_path, ensure_dir=True)
-        with open(meta_path, "w", encoding="utf-8") as handle:
-            json.dump(payload, handle, ensure_ascii=False, indent=2)
+        with self._lock:
+            self._cache.pop(meta_path, None)
+        # Sidecars are only read back by the tool, so skip pretty-printing.
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        write_atomic(meta_path, text.encode("utf-8"))
 
     def delete(self, log_path: str) -> None:
         targets = [self.path_for(log_path, ensure_dir=False)]
         legacy = f"{os.path.abspath(log_path)}.meta.json"
         if legacy not in targets:
             targets.append(legacy)
+        with self._lock:
+            for meta_path in targets:
+                self._cache.pop(meta_path, None)
         for meta_path in targets:
             if not meta_path or not os.path.exists(meta_path):
                 continue
@@ -1,22 +1,142 @@
 # core/log_parser.py
 import logging
+import os
 import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 时间戳解析缓存上限（同一毫秒/秒内的日志行大量重复）
+_TS_CACHE_MAX = 65536
+# 报文解析结果缓存上限（心跳、状态查询等报文大量重复）
+_MSG_CACHE_MAX = 8192
+
+# 预解析后的字段定义：(字段名, Start, Length, Escape, Escapes/Escape)
+ResolvedField = Tuple[str, Any, Any, Dict[str, Any], Any]
+
+_INSUFFICIENT = "内容不足，未能提取"
+
+# 索引行中的一个显示块：(kind, text, idx)。用普通 tuple 而非 NamedTuple，构造走 C 路径
+Segment = Tuple[str, str, int]
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """一条解析后的日志（行头 + 报文体两行）"""
+    timestamp: Optional[datetime]
+    original_line1: str
+    original_line2: str
+    parsed: str
+    segments: Tuple[Segment, ...]
+
+    # 兼容旧的 dict 式访问：entry['parsed'] / entry.get('timestamp')
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+# 两种行头共用时间戳前缀，合并为一个正则：每行只进入一次正则引擎
+_HEADER_RE = re.compile(
+    r'^(?P<ts>\d{2}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2}\.\d{3})'
+    r'(?:'
+    r' PID=\d+ D Node \d+, \*\*\* (?P<header>.*) \*\*\* \((?P<tail>.*)\)'
+    r'|'
+    r'\s+(?P<dir>Input|Output):\s+Node\s+(?P<node>\d+),\s+\d+\s+bytes\s+(?:<==|==>)\s+\d+'
+    r')$')
+
+# 报文体前的噪声字符、PID 行头中的版本号 / PID / 节点号
+_NOISE_PREFIX_RE = re.compile(r'^[^A-Za-z0-9]{5,12}')
+_VERSION_TOKEN_RE = re.compile(r"^\d{4}$")
+_PID_RE = re.compile(r"PID=\d+")
+_NODE_RE = re.compile(r"Node\s+(\d+)")
+
+# 多进程解析的门槛：结果回传后主进程反序列化并构造 LogEntry 的耗时约为单进程解析的 1/3~1/2，
+# 双核基本无收益，4 核以上也只有约 1.5 倍；Windows 下 spawn 子进程还要重新导入模块。
+# 因此只对特别大的输入、且至少 4 核时启用
+_PARALLEL_MIN_LINES = 1_000_000
+_PARALLEL_MIN_CPUS = 4
+# 每个分块的目标行数
+_PARALLEL_CHUNK_LINES = 100_000
+
+# 子进程内复用的解析器（由 _init_worker 按配置创建一次）
+_worker_parser: Optional["LogParser"] = None
+
+
+def _timestamp_from_text(s: str) -> datetime:
+    """按固定偏移解析 dd.mm.yy HH:MM:SS.fff；与 strptime('%d.%m.%y %H:%M:%S.%f') 结果一致。
+
+    strptime 每次调用都要查 locale 并跑一遍正则，这里直接切片转 int。
+    """
+    digits = s[0:2] + s[3:5] + s[6:8] + s[9:11] + s[12:14] + s[15:17] + s[18:]
+    if (len(s) != 21 or len(digits) != 15 or not digits.isdigit()
+            or s[2] != '.' or s[5] != '.' or s[8] != ' '
+            or s[11] != ':' or s[14] != ':' or s[17] != '.'):
+        raise ValueError(f"时间戳格式错误: {s!r}")
+    year = int(s[6:8])
+    # 与 %y 相同：69-99 -> 19xx，00-68 -> 20xx
+    year += 1900 if year >= 69 else 2000
+    return datetime(year, int(s[3:5]), int(s[0:2]), int(s[9:11]), int(s[12:14]),
+                    int(s[15:17]), int(s[18:21]) * 1000)
+
+
+def _match_header(line: str):
+    """行头必须以 dd.mm.yy HH:MM:SS.fff 开头；空行、报文体等非行头行不进入正则"""
+    if len(line) < 22 or line[2] != '.' or line[5] != '.' or line[8] != ' ' or line[17] != '.':
+        return None
+    return _HEADER_RE.match(line)
+
+
+def _init_worker(parser_config: Dict[str, Any]) -> None:
+    global _worker_parser
+    _worker_parser = LogParser(parser_config)
+
+
+def _parse_chunk(lines: List[str]) -> List[Tuple[Any, ...]]:
+    # 回传普通 tuple：slots dataclass 逐个对象 pickle/unpickle 比 tuple 慢数倍，LogEntry 交给主进程构造
+    return [(e.timestamp, e.original_line1, e.original_line2, e.parsed, e.segments)
+            for e in _worker_parser.iter_log_entries(lines)]
+
+
+def _split_chunks(lines: List[str], chunk_lines: int) -> List[List[str]]:
+    """按行头对齐切分：分界行的上一行不是行头，保证分界行不会被前一条目当作第二行吞掉"""
+    chunks = []
+    start = 0
+    total = len(lines)
+    while start < total:
+        cut = start + chunk_lines
+        while cut < total and _match_header(lines[cut - 1].strip()) is not None:
+            cut += 1
+        chunks.append(lines[start:cut])
+        start = cut
+    return chunks
+
 
 class LogParser:
     def __init__(self, parser_config: Dict[str, Any]):
         self.parser_config = parser_config
         self.logger = logging.getLogger(__name__)
+        self._ts_cache: Dict[str, datetime] = {}
+        self._content_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._segments_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (msg_type, version) -> 字段定义元组；None 表示配置了 Versions 但无此版本
+        self._resolved: Dict[Tuple[str, Optional[str]], Optional[Tuple[ResolvedField, ...]]] = {}
+        # (msg_type, version) -> 生成的专用解析函数；None 表示走通用解析
+        self._parsers: Dict[Tuple[str, str], Optional[Callable[[str], str]]] = {}
 
     def _strip_noise_prefix(self, content: str) -> str:
         try:
             s = content or ""
             s = s.lstrip()
-            m = re.match(r'^[^A-Za-z0-9]{5,12}', s)
+            m = _NOISE_PREFIX_RE.match(s)
             if m:
                 s = s[m.end():]
             return s.lstrip()
@@ -26,15 +146,29 @@ class LogParser:
     def extract_timestamp(self, line: str) -> Optional[datetime]:
         """提取日志行中的时间戳"""
         try:
-            match = re.search(r'^(\d{2}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2}\.\d{3})', line.strip())
-            if match:
-                timestamp_str = match.group(1)
-                return datetime.strptime(timestamp_str, '%d.%m.%y %H:%M:%S.%f')
-            return None
+            # 时间戳固定为行首 21 个字符（dd.mm.yy HH:MM:SS.fff），按固定偏移校验分隔符即可
+            s = line.lstrip()[:21]
+            if (len(s) != 21 or s[2] != '.' or s[5] != '.' or s[8] != ' '
+                    or s[11] != ':' or s[14] != ':' or s[17] != '.'):
+                return None
+            try:
+                return self._parse_timestamp(s)
+            except ValueError:
+                return None
         except Exception as e:
             self.logger.error(f"提取时间戳时发生错误：{e}")
             return None
 
+    def _parse_timestamp(self, timestamp_str: str) -> datetime:
+        """strptime 较慢，按原始时间戳文本缓存解析结果。"""
+        cached = self._ts_cache.get(timestamp_str)
+        if cached is None:
+            cached = _timestamp_from_text(timestamp_str)
+            if len(self._ts_cache) >= _TS_CACHE_MAX:
+                self._ts_cache.clear()
+            self._ts_cache[timestamp_str] = cached
+        return cached
+
     def get_version_from_content(self, content: str) -> Optional[str]:
         """从消息内容中提取版本信息"""
         try:
@@ -45,8 +179,108 @@ class LogParser:
             self.logger.error(f"获取版本信息时发生错误：{e}")
             return None
 
+    def _resolve_fields(self, msg_type: str, version: Optional[str]) -> Optional[Tuple[ResolvedField, ...]]:
+        """按 (msg_type, version) 展开一次字段配置，之后热路径只做一次 dict 查找。
+
+        version 为 None 时取报文顶层 Fields；配置了 Versions 但不含该版本时返回 None。
+        """
+        key = (msg_type, version)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        msg_config = self.parser_config[msg_type]
+        if version is not None and 'Versions' in msg_config:
+            version_config = msg_config['Versions'].get(version)
+            fields_config = version_config.get('Fields', {}) if version_config is not None else None
+        else:
+            fields_config = msg_config.get('Fields', {})
+
+        resolved: Optional[Tuple[ResolvedField, ...]] = None
+        if fields_config is not None:
+            items = []
+            for field, field_cfg in fields_config.items():
+                if not isinstance(field_cfg, dict):
+                    items.append((field, None, -1, {}, {}))
+                    continue
+                items.append((
+                    field,
+                    field_cfg.get('Start'),
+                    field_cfg.get('Length', -1),
+                    field_cfg.get('Escape', {}),
+                    field_cfg.get('Escapes') or field_cfg.get('Escape') or {},
+                ))
+            resolved = tuple(items)
+        self._resolved[key] = resolved
+        return resolved
+
+    def _build_content_parser(self, msg_type: str, version: str,
+                              fields: Tuple[ResolvedField, ...]) -> Optional[Callable[[str], str]]:
+        """为 (msg_type, version) 生成展开了切片偏移与转义表的专用解析函数。
+
+        生成的函数与通用循环输出完全一致；遇到非常规配置（Start/Length 非整数、
+        Escape 非 dict）时返回 None，由通用路径处理。
+        """
+        description = self.parser_config[msg_type].get('Description', '')
+        namespace: Dict[str, Any] = {'_INSUFFICIENT': _INSUFFICIENT}
+        body = ["def _parse(content):", "    n = len(content)"]
+        names = []
+        for i, (field, start, length, escape_config, _) in enumerate(fields):
+            if type(start) is not int or type(length) is not int:
+                return None
+            if escape_config and not isinstance(escape_config, dict):
+                return None
+            v = f"v{i}"
+            names.append(f"_n{i} + {v}")
+            namespace[f"_n{i}"] = f"{field}="
+            if start < 0:
+                body.append(f"    {v} = _INSUFFICIENT")
+                continue
+            body.append(f"    if n < {start}:")
+            body.append(f"        {v} = _INSUFFICIENT")
+            body.append("    else:")
+            if length == -1:
+                body.append(f"        {v} = content[{start}:].strip()")
+            else:
+                end = start + length
+                body.append(f"        {v} = content[{start}:{end}].strip() if {end} <= n else _INSUFFICIENT")
+            if escape_config:
+                namespace[f"_e{i}"] = escape_config
+                body.append(f"        {v} = f'{{{v}}}({{_e{i}[{v}]}})' if {v} in _e{i} else {v} + '(未定义的转义值)'")
+        namespace['_desc'] = f"{description}："
+        body.append(f"    return _desc + ','.join(({', '.join(names)}{',' if names else ''}))")
+        try:
+            exec(compile("\n".join(body), f"<log_parser {msg_type}/{version}>", "exec"), namespace)
+        except SyntaxError as e:
+            logger.error(f"生成 {msg_type}/{version} 解析函数失败：{e}")
+            return None
+        return namespace['_parse']
+
+    def _content_parser(self, msg_type: str, version: str,
+                        fields: Tuple[ResolvedField, ...]) -> Optional[Callable[[str], str]]:
+        key = (msg_type, version)
+        if key not in self._parsers:
+            self._parsers[key] = self._build_content_parser(msg_type, version, fields)
+        return self._parsers[key]
+
+    @staticmethod
+    def _cache_put(cache: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        cache[key] = value
+        if len(cache) > _MSG_CACHE_MAX:
+            cache.popitem(last=False)
+
     def parse_message_content(self, content: str) -> str:
-        """根据配置解析消息内容"""
+        """根据配置解析消息内容（相同报文直接命中缓存）"""
+        cached = self._content_cache.get(content)
+        if cached is not None:
+            self._content_cache.move_to_end(content)
+            return cached
+        parsed = self._parse_message_content(content)
+        self._cache_put(self._content_cache, content, parsed)
+        return parsed
+
+    def _parse_message_content(self, content: str) -> str:
         try:
             if len(content) < 25:
                 return content
@@ -60,25 +294,24 @@ class LogParser:
             if version is None:
                 return content
 
-            # 获取字段配置
-            if 'Versions' in msg_config:
-                if version in msg_config['Versions']:
-                    fields_config = msg_config['Versions'][version].get('Fields', {})
-                else:
-                    return content
-            else:
-                fields_config = msg_config.get('Fields', {})
+            fields = self._resolve_fields(msg_type, version)
+            if fields is None:
+                return content
 
-            # 解析字段
-            field_values = {}
-            for field, field_cfg in fields_config.items():
+            parser = self._content_parser(msg_type, version, fields)
+            if parser is not None:
+                return parser(content)
+
+            # 解析字段（通用路径）：直接拼接 "字段=值" 片段，末尾一次 join
+            parts: List[str] = []
+            for field, start, length, escape_config, _ in fields:
                 try:
-                    start = field_cfg['Start']
-                    length = field_cfg.get('Length', -1)
+                    if start is None:
+                        raise KeyError('Start')
 
                     # 检查内容长度是否足够
                     if start < 0 or len(content) < start:
-                        field_values[field] = "内容不足，未能提取"
+                        parts.append(field + "=" + _INSUFFICIENT)
                         continue
 
                     # 提取字段值
@@ -87,59 +320,64 @@ class LogParser:
                     else:
                         end = start + length
                         if end > len(content):
-                            field_value = "内容不足，未能提取"
+                            field_value = _INSUFFICIENT
                         else:
                             field_value = content[start:end].strip()
 
                     # 处理转义值
-                    escape_config = field_cfg.get('Escape', {})
                     if escape_config:
                         if field_value in escape_config:
-                            escaped_value = escape_config[field_value]
-                            field_values[field] = f"{field_value}({escaped_value})"
+                            parts.append(f"{field}={field_value}({escape_config[field_value]})")
                         else:
-                            field_values[field] = f"{field_value}(未定义的转义值)"
+                            parts.append(field + "=" + field_value + "(未定义的转义值)")
                     else:
-                        field_values[field] = field_value
+                        parts.append(field + "=" + field_value)
                 except Exception as e:
                     logger.error(f"解析字段 {field} 时发生错误：{e}")
-                    field_values[field] = "解析错误"
+                    parts.append(field + "=解析错误")
 
             # 构建解析结果
             description = msg_config.get('Description', '')
-            parsed_content = f"{description}："
-            parsed_content += ",".join(f"{field}={value}" for field, value in field_values.items())
-            return parsed_content
+            return f"{description}：" + ",".join(parts)
         except Exception as e:
             logger.error(f"解析消息内容时发生错误：{e}")
             return content
 
     def parse_message_segments(self, content: str) -> Dict[str, Any]:
-        result = {"message_type": "", "version": "", "fields": [], "segments": []}
+        """解析报文字段块；缓存命中时返回新的外层 dict/list，内部字段 dict 与缓存共享，调用方只读使用。"""
+        cached = self._segments_cache.get(content)
+        if cached is None:
+            cached = self._parse_message_segments(content)
+            self._cache_put(self._segments_cache, content, cached)
+        else:
+            self._segments_cache.move_to_end(content)
+        return {**cached, "fields": list(cached["fields"])}
+
+    def _parse_message_segments(self, content: str) -> Dict[str, Any]:
+        result = {"message_type": "", "version": "", "fields": [], "segments": ()}
         try:
             if len(content) < 25:
-                result["segments"] = [{"kind": "raw", "text": content, "idx": 0}]
+                result["segments"] = (("raw", content, 0),)
                 return result
             msg_type = content[16:24]
             if msg_type not in self.parser_config:
-                result["segments"] = [{"kind": "raw", "text": content, "idx": 0}]
+                result["segments"] = (("raw", content, 0),)
                 return result
-            msg_config = self.parser_config[msg_type]
             version = self.get_version_from_content(content)
             if version is None:
                 result["message_type"] = msg_type
-                result["segments"] = [{"kind": "raw", "text": content, "idx": 0}]
+                result["segments"] = (("raw", content, 0),)
                 return result
-            if 'Versions' in msg_config and version in msg_config['Versions']:
-                fields_config = msg_config['Versions'][version].get('Fields', {})
-            else:
-                fields_config = msg_config.get('Fields', {})
+            fields = self._resolve_fields(msg_type, version)
+            if fields is None:
+                fields = self._resolve_fields(msg_type, None)
             result["message_type"] = msg_type
             result["version"] = version
             idx = 0
-            for field, field_cfg in fields_config.items():
-                start = field_cfg.get('Start', 0)
-                length = field_cfg.get('Length', -1)
+            segments = []
+            for field, start, length, _, esc in fields:
+                if start is None:
+                    start = 0
                 if start < 0 or len(content) < start:
                     value = "内容不足"
                 else:
@@ -148,74 +386,157 @@ class LogParser:
                     else:
                         end = start + length
                         value = content[start:end].strip() if end <= len(content) else "内容不足"
-                esc = field_cfg.get('Escapes') or field_cfg.get('Escape') or {}
                 if isinstance(esc, dict) and value in esc:
                     disp = f"{value}({esc[value]})"
                 else:
                     disp = value if not esc else f"{value}(未定义转义)"
                 result["fields"].append({"name": field, "value": disp, "start": start, "length": length})
-                result["segments"].append({"kind": "field", "text": f"{field}={disp}", "idx": idx})
+                segments.append(("field", f"{field}={disp}", idx))
                 idx += 1
+            result["segments"] = tuple(segments)
             return result
         except Exception:
-            result["segments"] = [{"kind": "raw", "text": content, "idx": 0}]
+            result["segments"] = (("raw", content, 0),)
             return result
 
-    def parse_log_lines(self, log_lines: List[str]) -> List[Dict[str, Any]]:
-        """解析日志行，返回结构化日志条目"""
-        log_entries = []
-        i = 0
-        total_lines = len(log_lines)
-
-        # 预编译正则表达式提高效率
-        specific_pattern = re.compile(
-            r'^\d{2}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2}\.\d{3} PID=\d+ D Node \d+, \*\*\* (.*) \*\*\* \((.*)\)$')
-        direction_pattern = re.compile(
-            r'^(\d{2}\.\d{2}\.\d{2} \d{2}:\d{2}:\d{2}\.\d{3})\s+(Input|Output):\s+Node\s+(\d+),\s+(\d+)\s+bytes\s+(<==|==>)\s+(\d+)$')
-
-        while i < total_lines:
-            current_line = log_lines[i].strip()
-            if not current_line:
-                i += 1
+    def parse_message_both(self, content: str) -> Tuple[str, Dict[str, Any]]:
+        """一次得到 parse_message_content 与 parse_message_segments 的结果，两个缓存共用一次探测。"""
+        parsed = self._content_cache.get(content)
+        msg = self._segments_cache.get(content)
+        if parsed is None or msg is None:
+            parsed, msg = self._parse_message_both(content)
+            self._cache_put(self._content_cache, content, parsed)
+            self._cache_put(self._segments_cache, content, msg)
+        else:
+            self._content_cache.move_to_end(content)
+            self._segments_cache.move_to_end(content)
+        return parsed, {**msg, "fields": list(msg["fields"])}
+
+    def _parse_message_both(self, content: str) -> Tuple[str, Dict[str, Any]]:
+        """字段切片只做一次，同时产出文本与字段块；两者的显示文案保持各自原样。
+
+        非常规配置（版本缺失、Start/Length 非整数、Escape 非 dict）交回两个独立方法处理。
+        """
+        raw_segments = (("raw", content, 0),)
+        if len(content) < 25:
+            return content, {"message_type": "", "version": "", "fields": [], "segments": raw_segments}
+        msg_type = content[16:24]
+        if msg_type not in self.parser_config:
+            return content, {"message_type": "", "version": "", "fields": [], "segments": raw_segments}
+        version = self.get_version_from_content(content)
+        if version is None:
+            return content, {"message_type": msg_type, "version": "", "fields": [], "segments": raw_segments}
+
+        fields = self._resolve_fields(msg_type, version)
+        if fields is None or self._content_parser(msg_type, version, fields) is None:
+            return self._parse_message_content(content), self._parse_message_segments(content)
+
+        try:
+            n = len(content)
+            parts: List[str] = []
+            field_list: List[Dict[str, Any]] = []
+            segments: List[Segment] = []
+            for idx, (field, start, length, escape_config, esc) in enumerate(fields):
+                if start < 0 or n < start:
+                    parts.append(field + "=" + _INSUFFICIENT)
+                    value = "内容不足"
+                else:
+                    if length == -1:
+                        value = content[start:].strip()
+                    elif start + length > n:
+                        value = None
+                    else:
+                        value = content[start:start + length].strip()
+
+                    text_value = _INSUFFICIENT if value is None else value
+                    if escape_config:
+                        if text_value in escape_config:
+                            parts.append(f"{field}={text_value}({escape_config[text_value]})")
+                        else:
+                            parts.append(field + "=" + text_value + "(未定义的转义值)")
+                    else:
+                        parts.append(field + "=" + text_value)
+                    if value is None:
+                        value = "内容不足"
+
+                if isinstance(esc, dict) and value in esc:
+                    disp = f"{value}({esc[value]})"
+                else:
+                    disp = value if not esc else value + "(未定义转义)"
+                field_list.append({"name": field, "value": disp, "start": start, "length": length})
+                segments.append(("field", field + "=" + disp, idx))
+        except Exception:
+            return self._parse_message_content(content), self._parse_message_segments(content)
+
+        description = self.parser_config[msg_type].get('Description', '')
+        msg = {"message_type": msg_type, "version": version, "fields": field_list, "segments": tuple(segments)}
+        return f"{description}：" + ",".join(parts), msg
+
+    def parse_log_lines(self, log_lines: List[str]) -> List[LogEntry]:
+        """解析日志行，返回结构化日志条目；行数较多时按块分发到多进程"""
+        if len(log_lines) >= _PARALLEL_MIN_LINES and (os.cpu_count() or 1) >= _PARALLEL_MIN_CPUS:
+            try:
+                return self._parse_log_lines_parallel(log_lines)
+            except Exception as e:
+                logger.warning(f"多进程解析失败，回退为单进程：{e}")
+        return list(self.iter_log_entries(log_lines))
+
+    def _parse_log_lines_parallel(self, log_lines: List[str]) -> List[LogEntry]:
+        chunks = _split_chunks(log_lines, _PARALLEL_CHUNK_LINES)
+        workers = min(os.cpu_count() or 1, len(chunks))
+        log_entries: List[LogEntry] = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.parser_config,)) as executor:
+            for rows in executor.map(_parse_chunk, chunks):
+                log_entries.extend([LogEntry(*row) for row in rows])
+        return log_entries
+
+    def iter_log_entries(self, lines: Iterable[str]) -> Iterator[LogEntry]:
+        """逐条产出日志条目；只向前看一行，可直接消费文件句柄等流式输入"""
+        it = iter(lines)
+        next_line = next(it, None)
+
+        while next_line is not None:
+            current_line = next_line.strip()
+            next_line = next(it, None)
+            match = _match_header(current_line)
+            if match is None:
                 continue
 
             # 处理特定格式的日志行
-            if specific_pattern.match(current_line):
+            if match.group('dir') is None:
                 timestamp = self.extract_timestamp(current_line)
                 original_line1 = current_line
-                original_line2 = log_lines[i + 1].strip() if i + 1 < total_lines else "无内容"
+                original_line2 = next_line.strip() if next_line is not None else "无内容"
 
-                # PID 分支的类型/版本/字段来自第二行的消息体
-                msg = self.parse_message_segments(original_line2)
                 # 如果第二行无法提供类型/版本，尝试从第一行的 *** ... *** 中解析
                 msg_type_fallback = ""
                 version_fallback = ""
                 try:
-                    m2 = specific_pattern.match(original_line1)
-                    header = m2.group(1) if m2 else ""
+                    header = match.group('header') or ""
                     if header:
                         toks = header.strip().split()
                         if len(toks) >= 2:
                             msg_type_fallback = toks[0].strip()
                             cand_ver = toks[-1].strip()
-                            if re.match(r"^\d{4}$", cand_ver):
+                            if _VERSION_TOKEN_RE.match(cand_ver):
                                 version_fallback = cand_ver
                 except Exception:
                     pass
                 segs = []
                 if timestamp:
-                    ts_txt = timestamp.strftime('%d.%m.%y %H:%M:%S.%f')[:-3]
-                    segs.append({'kind': 'ts', 'text': ts_txt, 'idx': 0})
+                    # 能解析出时间戳说明行首 21 个字符就是 dd.mm.yy HH:MM:SS.fff，直接切片，不再 strftime 回写
+                    segs.append(('ts', current_line[:21], 0))
                 # 追加 PID 与节点号（基于第一行）
                 try:
                     pid_text = ""
                     if len(original_line1) >= 31:
                         pid_text = original_line1[22:31].strip()
                     if not pid_text:
-                        m_pid = re.search(r"PID=\d+", original_line1)
+                        m_pid = _PID_RE.search(original_line1)
                         pid_text = m_pid.group(0) if m_pid else ""
                     if pid_text:
-                        segs.append({'kind': 'pid', 'text': pid_text, 'idx': 1})
+                        segs.append(('pid', pid_text, 1))
                 except Exception:
                     pass
                 try:
@@ -226,10 +547,10 @@ class LogParser:
                         if comma_idx != -1:
                             node_text = sub[:comma_idx].strip()
                     if not node_text:
-                        m_node = re.search(r"Node\s+(\d+)", original_line1)
+                        m_node = _NODE_RE.search(original_line1)
                         node_text = m_node.group(1) if m_node else ""
                     if node_text:
-                        segs.append({'kind': 'node', 'text': node_text, 'idx': 2})
+                        segs.append(('node', node_text, 2))
                 except Exception:
                     pass
                 # 追加两条消息块：第一行与第二行
@@ -239,7 +560,7 @@ class LogParser:
                         start = 45
                         msg1 = original_line1[start:].strip()
                     if msg1:
-                        segs.append({'kind': 'pid_msg1', 'text': msg1, 'idx': 3})
+                        segs.append(('pid_msg1', msg1, 3))
                 except Exception:
                     pass
                 try:
@@ -248,73 +569,69 @@ class LogParser:
                         start2 = 45
                         msg2 = original_line2[start2:].strip()
                     if msg2:
-                        segs.append({'kind': 'pid_msg2', 'text': msg2, 'idx': 4})
+                        segs.append(('pid_msg2', msg2, 4))
                 except Exception:
                     pass
                 # PID 分支仅保留五块（ts, pid, node, msg1, msg2），不追加其他字段块
-                log_entries.append({
-                    'timestamp': timestamp,
-                    'original_line1': original_line1,
-                    'original_line2': original_line2,
-                    'parsed': self.parse_message_content(original_line2),
-                    'segments': segs
-                })
-                i += 2
+                yield LogEntry(
+                    timestamp=timestamp,
+                    original_line1=original_line1,
+                    original_line2=original_line2,
+                    parsed=self.parse_message_content(original_line2),
+                    segments=tuple(segs),
+                )
+                next_line = next(it, None)
                 continue
 
             # 处理方向性日志行
-            match = direction_pattern.match(current_line)
-            if match:
-                time_str = match.group(1)
-                direction = match.group(2)
-                node_number = match.group(3)
-                raw_message_content = log_lines[i + 1].strip() if i + 1 < total_lines else "无内容"
-
-                # 跳过无效内容
-                if raw_message_content.startswith("???") and len(raw_message_content) < 10:
-                    i += 1
-                    continue
-                if "PING_IPS" in raw_message_content or "PING_I_R" in raw_message_content:
-                    i += 1
-                    continue
+            time_str = match.group('ts')
+            direction = match.group('dir')
+            node_number = match.group('node')
+            raw_message_content = next_line.strip() if next_line is not None else "无内容"
 
-                # 恢复旧对齐：Output 分支先去除固定前缀，再进行噪声清理
-                base_content = raw_message_content
-                if direction == "Output" and len(base_content) >= 7:
-                    base_content = base_content[7:]
-                # 清理第二行前置无意义字符后再解析
-                message_content = self._strip_noise_prefix(base_content)
+            # 跳过无效内容
+            if raw_message_content.startswith("???") and len(raw_message_content) < 10:
+                continue
+            if "PING_IPS" in raw_message_content or "PING_I_R" in raw_message_content:
+                continue
 
-                # 解析消息内容
-                try:
-                    parsed_content = self.parse_message_content(message_content)
-                    log_line = f"{time_str:<16} {direction:<6} {node_number:>3}：{parsed_content}"
-                except Exception as e:
-                    logger.error(f"解析消息内容时发生错误：{e}")
-                    log_line = f"{time_str:<16} {direction:<6} {node_number:>3}：解析错误"
+            # 恢复旧对齐：Output 分支先去除固定前缀，再进行噪声清理
+            base_content = raw_message_content
+            if direction == "Output" and len(base_content) >= 7:
+                base_content = base_content[7:]
+            # 清理第二行前置无意义字符后再解析
+            message_content = self._strip_noise_prefix(base_content)
 
-                timestamp = self.extract_timestamp(current_line)
+            # 解析消息内容：文本与字段块一次完成
+            try:
+                parsed_content, msg = self.parse_message_both(message_content)
+                log_line = f"{time_str:<16} {direction:<6} {node_number:>3}：{parsed_content}"
+            except Exception as e:
+                logger.error(f"解析消息内容时发生错误：{e}")
+                log_line = f"{time_str:<16} {direction:<6} {node_number:>3}：解析错误"
                 msg = self.parse_message_segments(message_content)
-                segs = []
-                segs.append({'kind': 'ts', 'text': time_str, 'idx': 0})
-                segs.append({'kind': 'dir', 'text': direction, 'idx': 1})
-                segs.append({'kind': 'node', 'text': str(node_number), 'idx': 2})
-                if msg.get('message_type'):
-                    segs.append({'kind': 'msg_type', 'text': msg.get('message_type'), 'idx': 3})
-                if msg.get('version'):
-                    segs.append({'kind': 'ver', 'text': msg.get('version'), 'idx': 4})
-                base = 5
-                for s in msg.get('segments', []):
-                    segs.append({'kind': 'field', 'text': s.get('text', ''), 'idx': base + s.get('idx', 0)})
-                log_entries.append({
-                    'timestamp': timestamp,
-                    'original_line1': current_line,
-                    'original_line2': raw_message_content,
-                    'parsed': log_line,
-                    'segments': segs
-                })
-                i += 2
-            else:
-                i += 1
 
-        return log_entries
\ No newline at end of file
+            try:
+                timestamp = self._parse_timestamp(time_str)
+            except ValueError:
+                timestamp = None
+            segs = [
+                ('ts', time_str, 0),
+                ('dir', direction, 1),
+                ('node', str(node_number), 2),
+            ]
+            if msg.get('message_type'):
+                segs.append(('msg_type', msg.get('message_type'), 3))
+            if msg.get('version'):
+                segs.append(('ver', msg.get('version'), 4))
+            base = 5
+            for _, text, idx in msg['segments']:
+                segs.append(('field', text, base + idx))
+            yield LogEntry(
+                timestamp=timestamp,
+                original_line1=current_line,
+                original_line2=raw_message_content,
+                parsed=log_line,
+                segments=tuple(segs),
+            )
+            next_line = next(it, None)
\ No newline at end of file
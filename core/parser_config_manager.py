@@ -6,6 +6,8 @@ import shutil
 import time
 from typing import Dict, Any, Optional
 
+from .json_store import write_atomic
+
 
 class ParserConfigManager:
     def __init__(self, config_dir: str):
@@ -51,8 +53,7 @@ class ParserConfigManager:
         try:
             config_path = self.get_config_path(factory, system)
 
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            write_atomic(config_path, json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8'))
 
             self.logger.info(f"成功保存解析配置: {config_path}")
             return True
@@ -1,22 +1,239 @@
 # core/report_generator.py
+import gzip
 import logging
 import os
+import shutil
+import tempfile
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict
 import html
 
+from .log_parser import LogEntry
+
+logger = logging.getLogger(__name__)
+
+# 报告头部（样式 + 筛选脚本 + 索引容器开头），顶格书写以免缩进写进报告
+_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>日志分析报告</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f0f2f5;
+        }
+        .timestamp {
+            display: flex;
+            align-items: center;
+            padding: 10px;
+            margin: 5px 0;
+            background-color: #ffffff;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14px;
+            scroll-margin-top: 80px;
+        }
+        .index-number {
+            font-weight: bold;
+            margin-right: 10px;
+            color: #007bff;
+        }
+        .seg-fixed { display: inline-block; box-sizing: border-box; padding: 2px 6px; margin: 2px; border-radius: 6px; vertical-align: top; }
+        .seg-ts { width: 170px; }
+        .seg-dir { width: 80px; text-align: center; }
+        .seg-node { width: 90px; text-align: center; }
+        .seg-msgtype { width: 150px; text-align: center; }
+        .seg-ver { width: 90px; text-align: center; }
+        .seg-node-sm { width: 60px; text-align: center; }
+        .seg-msgtype-sm { width: 100px; text-align: center; }
+        .seg-ver-sm { width: 60px; text-align: center; }
+        .seg-pid { width: 140px; text-align: center; }
+        .seg-free { display: inline-block; padding: 2px 6px; margin: 2px; border-radius: 6px; }
+        .log-entry {
+            margin: 10px 0;
+            padding: 8px;
+            background-color: white;
+            border-radius: 4px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+            scroll-margin-top: 80px;
+        }
+        .log-entry pre {
+            white-space: pre-wrap;
+            word-wrap: break-word;
+            font-size: 13px;
+            line-height: 1.05;
+            margin: 0;
+            padding: 0;
+        }
+        .back-link {
+            display: inline-block;
+            margin-top: 2px;
+            text-align: right;
+            color: #007bff;
+            text-decoration: underline;
+            font-size: 12px;
+        }
+        #filterBar { position: sticky; top: 0; background: #ffffff; padding: 10px; margin-bottom: 10px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); display: flex; gap: 8px; align-items: center; }
+        #filterInput { flex: 1; height: 28px; font-size: 14px; padding: 4px 8px; border: 1px solid #d1d5db; border-radius: 4px; outline: none; }
+        .btn { height: 28px; padding: 0 12px; border: 1px solid #d1d5db; border-radius: 4px; background: #f9fafb; cursor: pointer; font-size: 13px; }
+        .btn-primary { background: #e5f0ff; border-color: #93c5fd; }
+        .divider { height: 1px; background: linear-gradient(to right, #e5e7eb, #cbd5e1, #e5e7eb); margin: 40px 0 32px; border: none; }
+        .gap { height: 100vh; }
+        @keyframes flashHighlight {
+            from { background-color: #fde68a; }
+            to { background-color: #ffffff; }
+        }
+        .flash-highlight { animation: flashHighlight 900ms ease-in-out 2 alternate; }
+        /* 屏幕外的索引行与原文条目跳过布局和绘制，长报告首屏更快；auto 记住已渲染过的实际高度 */
+        .timestamp { content-visibility: auto; contain-intrinsic-size: auto 48px; }
+        .log-entry { content-visibility: auto; contain-intrinsic-size: auto 80px; }
+    </style>
+    <script>
+        // 各行的小写文本只在首次筛选时从 DOM 取一次，之后每次筛选只做字符串查找
+        var filterIndex = null;
+        function buildFilterIndex() {
+            var rows = document.querySelectorAll('.timestamp');
+            var index = [];
+            for (var i = 0; i < rows.length; i++) {
+                var r = rows[i];
+                var raw = document.getElementById(r.getAttribute('data-id'));
+                var pre = raw ? raw.querySelector('pre') : null;
+                index.push({
+                    row: r,
+                    raw: raw,
+                    text: (r.textContent || '').toLowerCase(),
+                    rawText: pre ? (pre.textContent || '').toLowerCase() : '',
+                    shown: true
+                });
+            }
+            return index;
+        }
+        function applyFilter() {
+            var qRaw = document.getElementById('filterInput').value.trim();
+            var q = qRaw.toLowerCase();
+            if (!filterIndex) filterIndex = buildFilterIndex();
+            for (var i = 0; i < filterIndex.length; i++) {
+                var item = filterIndex[i];
+                var show = q === '' ? true : (item.text.indexOf(q) !== -1 || item.rawText.indexOf(q) !== -1);
+                // 显示状态不变的行不写 style，避免无谓的重排
+                if (show === item.shown) continue;
+                item.shown = show;
+                item.row.style.display = show ? '' : 'none';
+                if (item.raw) item.raw.style.display = show ? '' : 'none';
+            }
+        }
+        var filterTimer = null;
+        function filterInputChanged() {
+            clearTimeout(filterTimer);
+            filterTimer = setTimeout(applyFilter, 120);
+        }
+        function clearFilter() {
+            document.getElementById('filterInput').value = '';
+            applyFilter();
+        }
+        function filterKey(e) { if (e.key === 'Enter') applyFilter(); }
+        function filterKey(e) { if (e.key === 'Enter') window.applyFilter(); }
+        var applyFilter = window.applyFilter;
+        var clearFilter = window.clearFilter;
+        var filterKey = window.filterKey;
+        function flashTargetById(id) {
+            if (!id) return;
+            var el = document.getElementById(id);
+            if (!el) return;
+            el.classList.remove('flash-highlight');
+            void el.offsetWidth;
+            el.classList.add('flash-highlight');
+        }
+        window.addEventListener('hashchange', function() {
+            var id = (location.hash || '').replace('#','');
+            flashTargetById(id);
+        });
+        (function(){
+            var id = (location.hash || '').replace('#','');
+            flashTargetById(id);
+        })();
+    </script>
+</head>
+<body>
+    <h1>日志索引</h1>
+    <div id="filterBar">
+        <input id="filterInput" type="text" placeholder="输入关键字筛选" onkeydown="filterKey(event)" oninput="filterInputChanged()" />
+        <button class="btn btn-primary" onclick="applyFilter()">筛选</button>
+        <button class="btn" onclick="clearFilter()">重置</button>
+    </div>
+    <div id="timestamps">\n"""
+
+# 索引行 / 原文条目 / 分隔区 / 尾部模板；逐行套用的模板用 % 位置参数，比关键字 format 快数倍
+# 索引行拆成首尾两段，行内片段直接写入缓冲，不再逐行 join
+# 模板一律顶格书写：缩进空白会原样写进每份报告的每一行
+_INDEX_ROW_OPEN = """<div class="timestamp" id="ts_%d" data-id="log_%d" onclick="location.href='#log_%d'">
+<span class="index-number">%d.</span>
+"""
+_INDEX_ROW_CLOSE = """
+</div>\n"""
+_INDEX_END = "</div>\n<hr class=\"divider\">\n<div class=\"gap\"></div>\n"
+_LOG_ENTRY = """<div class="log-entry" id="log_%d">
+<pre>%s</pre>
+<a href="#ts_%d" class="back-link">返回索引</a>
+</div>\n"""
+_HTML_TAIL = "</body>\n</html>"
+
+# 字段块轮换底色；方向块按 Input/Output 取色（其它取默认色）
+_PALETTE = ('#e3f2fd', '#e8f5e9', '#fff3e0', '#ede7f6', '#e0f7fa')
+_FIELD_SPAN_OPEN = tuple(
+    f'<span class="seg-free" style="background:{bg};color:#1b1f23;">' for bg in _PALETTE
+)
+_DIR_BG = {'input': '#d1fae5', 'output': '#fee2e2'}
+_DIR_BG_DEFAULT = '#ede7f6'
+
+# PID 行各块的起始标签；空块以 &nbsp; 占位
+_TS_SPAN_OPEN = '<span class="seg-fixed seg-ts" style="background:#e3f2fd;color:#1b1f23;">'
+_PID_SPAN_OPEN = '<span class="seg-fixed seg-pid" style="background:#fde68a;color:#1b1f23;">'
+_NODE_SPAN_OPEN = '<span class="seg-fixed seg-node-sm" style="background:#e8f5e9;color:#1b1f23;">'
+_NBSP = '&nbsp;'
+
+# 带方向的报文行固定为 时间/方向/节点:类型/版本 五块，整段一次 % 生成
+# 参数依次为：时间、方向底色、方向、节点、类型、版本
+_DIR_ROW_HEAD = (
+    '<span class="seg-fixed seg-ts" style="background:#e3f2fd;color:#1b1f23;">%s</span>'
+    '<span class="seg-fixed seg-dir" style="background:%s;color:#1b1f23;">%s</span>'
+    '<span class="seg-fixed seg-node-sm" style="background:#e8f5e9;color:#1b1f23;">%s</span>'
+    ':'
+    '<span class="seg-fixed seg-msgtype-sm" style="background:#fff3e0;color:#1b1f23;">%s</span>'
+    '<span class="seg-fixed seg-ver-sm" style="background:#e0f7fa;color:#1b1f23;">%s</span>'
+)
+
+# 片段累积到该数量后合并为一次 write，避免整份报告驻留内存
+_FLUSH_PARTS = 4096
+_WRITE_BUFFER = 1 << 20
+
+# 输出路径以 .gz 结尾时边写边压缩；级别 1 压缩快，体积仍能缩小数倍
+_GZIP_LEVEL = 1
+
+# 日志原文段先写入溢出临时文件，超过该大小才落盘
+_SPOOL_MAX = 64 * 1024 * 1024
+
 
 class ReportGenerator:
     def __init__(self, output_dir: str):
         self.output_dir = output_dir
-        self.logger = logging.getLogger(__name__)
-        os.makedirs(output_dir, exist_ok=True)
+        self.logger = logger
+        # 本实例已创建过的目录，重复生成报告时不再逐次 makedirs
+        self._dirs_made = set()
+        self._ensure_dir(output_dir)
+
+    def _ensure_dir(self, path: str) -> None:
+        if path in self._dirs_made:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._dirs_made.add(path)
 
     def _get_timestamp(self) -> str:
         """获取当前时间戳"""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    def generate_html_logs(self, log_entries: List[Dict[str, Any]], output_path: str) -> str:
+    def generate_html_logs(self, log_entries: Iterable[LogEntry], output_path: str) -> str:
         """生成HTML格式的日志报告 - 修复参数问题"""
         try:
 
@@ -24,223 +241,114 @@ class ReportGenerator:
             # analysis_info = self._parse_filename_info(filename)
 
             # 确保输出目录存在
-            output_dir = os.path.dirname(output_path)
-            os.makedirs(output_dir, exist_ok=True)
+            self._ensure_dir(os.path.dirname(output_path))
 
-            self.logger.info(f"生成HTML报告，输出路径: {output_path}，日志条目数: {len(log_entries)}")
+            self.logger.info("生成HTML报告，输出路径: %s", output_path)
 
-            # 使用流式写入提高大文件处理效率
-            with open(output_path, 'w', encoding='utf-8') as f:
+            # 条目只遍历一遍：索引直接写报告，原文段暂存到 spool，索引写完后再接上；
+            # 片段先拼进缓冲，按批合并写入：写调用少，内存占用也有上限
+            count = 0
+            with self._open_report(output_path) as f, \
+                    tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX, mode='w+', encoding='utf-8', newline='') as spool:
                 # 写入HTML头部
-                f.write("""<!DOCTYPE html>
-            <html>
-            <head>
-                <title>日志分析报告</title>
-                <style>
-                    body {
-                        font-family: Arial, sans-serif;
-                        margin: 20px;
-                        background-color: #f0f2f5;
-                    }
-                    .timestamp {
-                        display: flex;
-                        align-items: center;
-                        padding: 10px;
-                        margin: 5px 0;
-                        background-color: #ffffff;
-                        border-radius: 4px;
-                        cursor: pointer;
-                        font-size: 14px;
-                        scroll-margin-top: 80px;
-                    }
-                    .index-number {
-                        font-weight: bold;
-                        margin-right: 10px;
-                        color: #007bff;
-                    }
-                    .seg-fixed { display: inline-block; box-sizing: border-box; padding: 2px 6px; margin: 2px; border-radius: 6px; vertical-align: top; }
-                    .seg-ts { width: 170px; }
-                    .seg-dir { width: 80px; text-align: center; }
-                    .seg-node { width: 90px; text-align: center; }
-                    .seg-msgtype { width: 150px; text-align: center; }
-                    .seg-ver { width: 90px; text-align: center; }
-                    .seg-node-sm { width: 60px; text-align: center; }
-                    .seg-msgtype-sm { width: 100px; text-align: center; }
-                    .seg-ver-sm { width: 60px; text-align: center; }
-                    .seg-pid { width: 140px; text-align: center; }
-                    .seg-free { display: inline-block; padding: 2px 6px; margin: 2px; border-radius: 6px; }
-                    .log-entry {
-                        margin: 10px 0;
-                        padding: 8px;
-                        background-color: white;
-                        border-radius: 4px;
-                        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-                        scroll-margin-top: 80px;
-                    }
-                    .log-entry pre {
-                        white-space: pre-wrap;
-                        word-wrap: break-word;
-                        font-size: 13px;
-                        line-height: 1.05;
-                        margin: 0;
-                        padding: 0;
-                    }
-                    .back-link {
-                        display: inline-block;
-                        margin-top: 2px;
-                        text-align: right;
-                        color: #007bff;
-                        text-decoration: underline;
-                        font-size: 12px;
-                    }
-                    #filterBar { position: sticky; top: 0; background: #ffffff; padding: 10px; margin-bottom: 10px; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.08); display: flex; gap: 8px; align-items: center; }
-                    #filterInput { flex: 1; height: 28px; font-size: 14px; padding: 4px 8px; border: 1px solid #d1d5db; border-radius: 4px; outline: none; }
-                    .btn { height: 28px; padding: 0 12px; border: 1px solid #d1d5db; border-radius: 4px; background: #f9fafb; cursor: pointer; font-size: 13px; }
-                    .btn-primary { background: #e5f0ff; border-color: #93c5fd; }
-                    .divider { height: 1px; background: linear-gradient(to right, #e5e7eb, #cbd5e1, #e5e7eb); margin: 40px 0 32px; border: none; }
-                    .gap { height: 100vh; }
-                    @keyframes flashHighlight {
-                        from { background-color: #fde68a; }
-                        to { background-color: #ffffff; }
-                    }
-                    .flash-highlight { animation: flashHighlight 900ms ease-in-out 2 alternate; }
-                </style>
-                <script>
-                    function applyFilter() {
-                        var qRaw = document.getElementById('filterInput').value.trim();
-                        var q = qRaw.toLowerCase();
-                        var rows = document.querySelectorAll('.timestamp');
-                        for (var i = 0; i < rows.length; i++) {
-                            var r = rows[i];
-                            var id = r.getAttribute('data-id');
-                            var raw = document.getElementById(id);
-                            var text = (r.textContent || '').toLowerCase();
-                            var pre = raw ? raw.querySelector('pre') : null;
-                            var rawText = pre ? (pre.textContent || '').toLowerCase() : '';
-                            var show = q === '' ? true : (text.indexOf(q) !== -1 || rawText.indexOf(q) !== -1);
-                            r.style.display = show ? '' : 'none';
-                            if (raw) raw.style.display = show ? '' : 'none';
-                        }
-                    }
-                    function clearFilter() {
-                        document.getElementById('filterInput').value = '';
-                        applyFilter();
-                    }
-                    function filterKey(e) { if (e.key === 'Enter') applyFilter(); }
-                    function filterKey(e) { if (e.key === 'Enter') window.applyFilter(); }
-                    var applyFilter = window.applyFilter;
-                    var clearFilter = window.clearFilter;
-                    var filterKey = window.filterKey;
-                    function flashTargetById(id) {
-                        if (!id) return;
-                        var el = document.getElementById(id);
-                        if (!el) return;
-                        el.classList.remove('flash-highlight');
-                        void el.offsetWidth;
-                        el.classList.add('flash-highlight');
-                    }
-                    window.addEventListener('hashchange', function() {
-                        var id = (location.hash || '').replace('#','');
-                        flashTargetById(id);
-                    });
-                    (function(){
-                        var id = (location.hash || '').replace('#','');
-                        flashTargetById(id);
-                    })();
-                </script>
-            </head>
-            <body>
-                <h1>日志索引</h1>
-                <div id="filterBar">
-                    <input id="filterInput" type="text" placeholder="输入关键字筛选" onkeydown="filterKey(event)" />
-                    <button class="btn btn-primary" onclick="applyFilter()">筛选</button>
-                    <button class="btn" onclick="clearFilter()">重置</button>
-                </div>
-                <div id="timestamps">\n""")
+                buf: List[str] = [_HTML_HEAD]
+                body: List[str] = []
+                # 热循环里反复用到的方法先绑定为局部变量，省去每条的属性查找
+                emit = buf.append
+                extend = buf.extend
+                palette_size = len(_PALETTE)
+                emit_body = body.append
+                escape = html.escape
 
                 # 写入时间戳索引（模块化片段，仅影响可点击行）
                 for index, entry in enumerate(log_entries):
-                    log_id = f"log_{index}"
-                    segs = entry.get('segments') or []
-                    palette = ['#e3f2fd', '#e8f5e9', '#fff3e0', '#ede7f6', '#e0f7fa']
-                    parts = []
-                    block_map = {'ts': '', 'dir': '', 'node': '', 'msg_type': '', 'ver': '', 'pid': '', 'pid_msg1': '', 'pid_msg2': ''}
-                    for s in segs:
-                        k = s.get('kind')
-                        if k in block_map and not block_map[k]:
-                            block_map[k] = s.get('text', '')
-                    nbsp = '&nbsp;'
-                    has_dir = bool(block_map['dir'])
+                    segs = entry.segments
+                    emit(_INDEX_ROW_OPEN % (index, index, index, index + 1))
+                    # 每类段取首个非空文本；用局部变量代替逐行新建的 dict
+                    ts = dir_text = node_text = msgtype_text = ver_text = pid_text = msg1 = msg2 = ''
+                    # 字段块在同一趟里渲染好，行首固定块输出后再整体接上
+                    fields = []
+                    for k, text, idx in segs:
+                        if k == 'field':
+                            fields.append(_FIELD_SPAN_OPEN[idx % palette_size] + escape(text) + '</span>')
+                            continue
+                        if k == 'ts':
+                            ts = ts or escape(text)
+                        elif k == 'dir':
+                            dir_text = dir_text or escape(text)
+                        elif k == 'node':
+                            node_text = node_text or escape(text)
+                        elif k == 'msg_type':
+                            msgtype_text = msgtype_text or escape(text)
+                        elif k == 'ver':
+                            ver_text = ver_text or escape(text)
+                        elif k == 'pid':
+                            pid_text = pid_text or escape(text)
+                        elif k == 'pid_msg1':
+                            msg1 = msg1 or escape(text)
+                        elif k == 'pid_msg2':
+                            msg2 = msg2 or escape(text)
+                    has_dir = bool(dir_text)
                     if has_dir:
-                        ts_text = block_map['ts'] or nbsp
-                        dir_text = block_map['dir'] or nbsp
-                        node_text = block_map['node'] or nbsp
-                        msgtype_text = block_map['msg_type'] or nbsp
-                        ver_text = block_map['ver'] or nbsp
-                        parts.append(f'<span class="seg-fixed seg-ts" style="background:#e3f2fd;color:#1b1f23;">{ts_text}</span>')
-                        dlow = str(block_map['dir']).lower()
-                        if dlow.startswith('input'):
-                            parts.append(f'<span class="seg-fixed seg-dir" style="background:#d1fae5;color:#1b1f23;">{dir_text}</span>')
-                        elif dlow.startswith('output'):
-                            parts.append(f'<span class="seg-fixed seg-dir" style="background:#fee2e2;color:#1b1f23;">{dir_text}</span>')
-                        else:
-                            parts.append(f'<span class="seg-fixed seg-dir" style="background:#ede7f6;color:#1b1f23;">{dir_text}</span>')
-                        parts.append(f'<span class="seg-fixed seg-node-sm" style="background:#e8f5e9;color:#1b1f23;">{node_text}</span>')
-                        parts.append(':')
-                        parts.append(f'<span class="seg-fixed seg-msgtype-sm" style="background:#fff3e0;color:#1b1f23;">{msgtype_text}</span>')
-                        parts.append(f'<span class="seg-fixed seg-ver-sm" style="background:#e0f7fa;color:#1b1f23;">{ver_text}</span>')
+                        emit(_DIR_ROW_HEAD % (
+                            ts or _NBSP,
+                            _DIR_BG.get(dir_text.lower(), _DIR_BG_DEFAULT),
+                            dir_text,
+                            node_text or _NBSP,
+                            msgtype_text or _NBSP,
+                            ver_text or _NBSP,
+                        ))
                     else:
-                        ts_text = block_map['ts'] or nbsp
-                        pid_text = (block_map['pid'] or '').strip()
-                        node_text = (block_map['node'] or '').strip()
-                        parts.append(f'<span class="seg-fixed seg-ts" style="background:#e3f2fd;color:#1b1f23;">{ts_text}</span>')
+                        emit(_TS_SPAN_OPEN + (ts or _NBSP) + '</span>')
+                        pid_text = pid_text.strip()
                         if pid_text:
-                            parts.append(f'<span class="seg-fixed seg-pid" style="background:#fde68a;color:#1b1f23;">{pid_text}</span>')
+                            emit(_PID_SPAN_OPEN + pid_text + '</span>')
+                        node_text = node_text.strip()
                         if node_text:
-                            parts.append(f'<span class="seg-fixed seg-node-sm" style="background:#e8f5e9;color:#1b1f23;">{node_text}</span>')
-                        msg1 = (block_map['pid_msg1'] or '').strip()
-                        msg2 = (block_map['pid_msg2'] or '').strip()
+                            emit(_NODE_SPAN_OPEN + node_text + '</span>')
+                        msg1 = msg1.strip()
                         if msg1:
-                            parts.append(f'<span class="seg-free" style="background:#e3f2fd;color:#1b1f23;">{msg1}</span>')
+                            emit(_FIELD_SPAN_OPEN[0] + msg1 + '</span>')
+                        msg2 = msg2.strip()
                         if msg2:
-                            parts.append(f'<span class="seg-free" style="background:#e8f5e9;color:#1b1f23;">{msg2}</span>')
-                    if has_dir:
-                        for s in segs:
-                            if s.get('kind') != 'field':
-                                continue
-                            idx = int(s.get('idx', 0))
-                            bg = palette[idx % len(palette)]
-                            text = s.get('text', '')
-                            parts.append(f'<span class="seg-free" style="background:{bg};color:#1b1f23;">{text}</span>')
-                    line_html = ''.join(parts)
-                    f.write(f"""        <div class="timestamp" id="ts_{index}" data-id="{log_id}" onclick="location.href='#{log_id}'">
-                        <span class="index-number">{index + 1}.</span>
-                        {line_html}
-                    </div>\n""")
+                            emit(_FIELD_SPAN_OPEN[1] + msg2 + '</span>')
+                    if has_dir and fields:
+                        extend(fields)
+                    emit(_INDEX_ROW_CLOSE)
+                    if len(buf) >= _FLUSH_PARTS:
+                        f.write(''.join(buf))
+                        buf.clear()
 
-                f.write("    </div>\n")
-                f.write("    <hr class=\"divider\">\n")
-                f.write("    <div class=\"gap\"></div>\n")
+                    # 日志条目（保持原始日志原文，不做模块化）
+                    raw_text = f"{entry.original_line1}\n{entry.original_line2}"
+                    emit_body(_LOG_ENTRY % (index, escape(raw_text), index))
+                    if len(body) >= _FLUSH_PARTS:
+                        spool.write(''.join(body))
+                        body.clear()
+                    count += 1
 
-                # 写入日志条目（保持原始日志原文，不做模块化）
-                for index, entry in enumerate(log_entries):
-                    log_id = f"log_{index}"
-                    raw_text = f"{entry['original_line1']}\n{entry['original_line2']}"
-                    f.write(f"""    <div class="log-entry" id="{log_id}">
-<pre>{html.escape(raw_text)}</pre>
-<a href="#ts_{index}" class="back-link">返回索引</a>
-</div>\n""")
+                emit(_INDEX_END)
+                f.write(''.join(buf))
+                spool.write(''.join(body))
+                spool.seek(0)
+                shutil.copyfileobj(spool, f, _WRITE_BUFFER)
 
                 # 写入HTML尾部
-                f.write("</body>\n</html>")
+                f.write(_HTML_TAIL)
 
-            self.logger.info(f"HTML报告生成完成: {output_path}")
+            self.logger.info("HTML报告生成完成: %s，日志条目数: %d", output_path, count)
             return output_path
 
         except Exception as e:
-            self.logger.error(f"生成HTML报告失败: {str(e)}")
+            self.logger.error("生成HTML报告失败: %s", e)
             return None
 
+    def _open_report(self, output_path: str):
+        """打开报告输出文件；.gz 路径直接写 gzip 压缩流。"""
+        if output_path.endswith('.gz'):
+            return gzip.open(output_path, 'wt', compresslevel=_GZIP_LEVEL, encoding='utf-8')
+        return open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER)
+
     def _parse_filename_info(self, filename: str) -> Dict[str, str]:
         """从文件名中解析分析信息"""
         try:
@@ -263,5 +371,5 @@ class ReportGenerator:
             return info
 
         except Exception as e:
-            self.logger.error(f"解析文件名信息失败: {str(e)}")
+            self.logger.error("解析文件名信息失败: %s", e)
             return {'title': filename}
@@ -7,15 +7,17 @@ from typing import Dict, Iterable
 
 from .json_store import JsonStore
 
+logger = logging.getLogger(__name__)
+
 
 class ReportMappingStore:
     """简单的 JSON 映射仓库，负责读取/写入 report_mappings.json。"""
 
     def __init__(self, filepath: str):
         self.filepath = filepath
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        self._store = JsonStore(filepath, default_factory=dict)
+        self._store = JsonStore(filepath, default_factory=dict, pretty=False)
 
     def _load(self) -> Dict[str, str]:
         return self._store.load()
@@ -26,13 +28,18 @@ class ReportMappingStore:
 
     def save_many(self, log_paths: Iterable[str], report_path: str) -> None:
         mapping = self._load()
+        changed = False
         for path in log_paths:
-            if path:
+            if path and mapping.get(path) != report_path:
                 mapping[path] = report_path
-        self._save(mapping)
+                changed = True
+        # 映射未变化时不重写整个文件
+        if changed:
+            self._save(mapping)
 
     def get(self, log_path: str) -> str:
-        return self._load().get(log_path, "")
+        # 单键查询只读，不必深拷贝整张映射表
+        return self._store.peek().get(log_path, "")
 
     def delete(self, log_path: str) -> None:
         mapping = self._load()
@@ -1,12 +1,24 @@
 # core/template_manager.py
 import os
+import copy
 import json
+import threading
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
+
+from .json_store import write_atomic
+
+try:  # 可选依赖：有 orjson 时用它读写模板文件，否则退回标准库 json
+    import orjson
+except ImportError:
+    orjson = None
 
 ISO = "%Y-%m-%dT%H:%M:%S"
 
+# 模板文档, 工厂匹配键, 系统匹配键, 小写检索文本（name + nodes）
+_TemplateRow = Tuple[Dict[str, Any], FrozenSet[str], FrozenSet[str], Optional[Tuple[str, ...]]]
+
 
 class TemplateManager:
     """
@@ -27,6 +39,9 @@ class TemplateManager:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
         os.makedirs(self.base_dir, exist_ok=True)
+        # (各模板文件的 (文件名, mtime_ns, 大小), 全部模板)；外部原地改写文件不会刷新目录 mtime，所以按文件比对
+        self._all_cache: Optional[Tuple[Tuple[Tuple[str, int, int], ...], List[_TemplateRow]]] = None
+        self._lock = threading.Lock()
 
     def _path(self, tid: str) -> str:
         return os.path.join(self.base_dir, f"{tid}.json")
@@ -50,47 +65,21 @@ class TemplateManager:
         - q：命中 name 或 nodes 中的任意一个
         """
         items: List[Dict[str, Any]] = []
-        for fn in os.listdir(self.base_dir):
-            if not fn.endswith(".json"):
+        # 过滤条件只归一化一次；匹配键与小写文本在加载时已预先算好，这里单趟判定
+        factory_key = str(factory).strip()
+        system_key = str(system).strip()
+        ql = q.lower() if q else ""
+        for data, factory_keys, system_keys, texts in self._load_all():
+            # 工厂过滤：factory_id / factory_name / factory 任一命中
+            if factory and factory_key not in factory_keys:
                 continue
-            p = os.path.join(self.base_dir, fn)
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                # 兼容字段归一：确保 name 别名存在
-                self._ensure_alias_fields(data)
-
-                # 工厂过滤
-                if factory and not self._match_any(
-                    factory,
-                    data.get("factory_id"),
-                    data.get("factory_name"),
-                    data.get("factory"),
-                ):
-                    continue
-
-                # 系统过滤
-                if system and not self._match_any(
-                    system,
-                    data.get("system_id"),
-                    data.get("system_name"),
-                    data.get("system"),
-                ):
-                    continue
-
-                # 关键词过滤
-                if q:
-                    ql = q.lower()
-                    name_hit = ql in (data.get("name", "").lower())
-                    nodes_hit = any(ql in str(n).lower() for n in data.get("nodes", []))
-                    if not (name_hit or nodes_hit):
-                        continue
-
-                items.append(data)
-            except Exception:
-                # 单个文件异常不影响整体
+            # 系统过滤：system_id / system_name / system 任一命中
+            if system and system_key not in system_keys:
                 continue
+            # 关键词过滤：name 或任一节点包含关键词（name 非字符串的文档不参与检索）
+            if ql and (texts is None or not any(ql in t for t in texts)):
+                continue
+            items.append(data)
 
         # 最新更新在前（若缺失 updated_at，则回退 created_at）
         items.sort(
@@ -100,14 +89,14 @@ class TemplateManager:
         total = len(items)
         start = max(page - 1, 0) * page_size
         end = start + page_size
-        return {"items": items[start:end], "total": total}
+        # 缓存中的文档只读共享，返回给调用方的是副本
+        return {"items": [copy.deepcopy(x) for x in items[start:end]], "total": total}
 
     def get(self, tid: str) -> Optional[Dict[str, Any]]:
         p = self._path(tid)
         if not os.path.exists(p):
             return None
-        with open(p, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = self._read_json(p)
         # 兼容：保证别名字段齐全
         self._ensure_alias_fields(data)
         return data
@@ -197,6 +186,7 @@ class TemplateManager:
         if not os.path.exists(p):
             return False
         os.remove(p)
+        self._all_cache = None
         return True
 
     # ---------- 联动：按 server_config 批量更新/删除 ----------
@@ -220,8 +210,7 @@ class TemplateManager:
                 continue
             p = os.path.join(self.base_dir, fn)
             try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = self._read_json(p)
                 if data.get("server_config_id") != str(server_config_id):
                     continue
 
@@ -264,8 +253,7 @@ class TemplateManager:
                 continue
             p = os.path.join(self.base_dir, fn)
             try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = self._read_json(p)
                 if data.get("server_config_id") == str(server_config_id):
                     to_delete.append(os.path.splitext(fn)[0])
             except Exception:
@@ -291,22 +279,80 @@ class TemplateManager:
         out = list(dict.fromkeys(out))
         return out
 
-    def _atomic_write(self, tid: str, doc: Dict[str, Any]) -> None:
-        tmp = self._path(f"{tid}.tmp")
-        dst = self._path(tid)
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(doc, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, dst)
-
-    def _match_any(self, needle: str, *candidates: Optional[str]) -> bool:
-        """needle 同时尝试匹配若干候选（字符串化后比较）"""
-        ns = str(needle).strip()
-        for c in candidates:
-            if c is None:
+    def _load_all(self) -> List[_TemplateRow]:
+        """读取目录下全部模板（已补齐别名字段）；各模板文件都未变化时复用上次结果。"""
+        stamp = self._scan_stamp()
+        with self._lock:
+            cached = self._all_cache
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        rows: List[_TemplateRow] = []
+        for fn, _, _ in stamp:
+            try:
+                data = self._read_json(os.path.join(self.base_dir, fn))
+                # 兼容字段归一：确保 name 别名存在
+                self._ensure_alias_fields(data)
+                rows.append(self._index_row(data))
+            except Exception:
+                # 单个文件异常不影响整体
                 continue
-            if ns == str(c).strip():
-                return True
-        return False
+        with self._lock:
+            self._all_cache = (stamp, rows)
+        return rows
+
+    def _scan_stamp(self) -> Tuple[Tuple[str, int, int], ...]:
+        """一次 scandir 取全部模板文件的 (文件名, mtime_ns, 大小)，不打开文件。"""
+        stamp = []
+        with os.scandir(self.base_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    # 扫描途中被删除
+                    continue
+                stamp.append((entry.name, st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _index_row(self, data: Dict[str, Any]) -> _TemplateRow:
+        """预先算好过滤所需的匹配键与小写检索文本。"""
+        factory_keys = frozenset(
+            str(c).strip()
+            for c in (data.get("factory_id"), data.get("factory_name"), data.get("factory"))
+            if c is not None
+        )
+        system_keys = frozenset(
+            str(c).strip()
+            for c in (data.get("system_id"), data.get("system_name"), data.get("system"))
+            if c is not None
+        )
+        name = data.get("name", "")
+        texts: Optional[Tuple[str, ...]] = None
+        if isinstance(name, str):
+            # nodes 可能是 null 或单个值：检索文本按能取到的算，不能让坏数据把模板挤出列表
+            nodes = data.get("nodes") or []
+            if not isinstance(nodes, (list, tuple)):
+                nodes = [nodes]
+            texts = (name.lower(),) + tuple(str(n).lower() for n in nodes)
+        return data, factory_keys, system_keys, texts
+
+    def _read_json(self, path: str) -> Any:
+        with open(path, "rb") as f:
+            raw = f.read()
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw.decode("utf-8"))
+
+    def _atomic_write(self, tid: str, doc: Dict[str, Any]) -> None:
+        if orjson is not None:
+            data = orjson.dumps(doc, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(doc, ensure_ascii=False, indent=2).encode("utf-8")
+        # 临时文件不以 .json 结尾，列表扫描不会误读写了一半的文件
+        write_atomic(self._path(tid), data)
+        self._all_cache = None
 
     def _ensure_alias_fields(self, data: Dict[str, Any]) -> None:
         """
@@ -671,6 +671,7 @@ def analyze_logs():
                     'generate_html': _get_bool(data or {}, 'generate_html', default=True),
                     'generate_original_log': _get_bool(data or {}, 'generate_original_log', default=True),
                     'generate_sorted_log': _get_bool(data or {}, 'generate_sorted_log', default=True),
+                    'compress_html': _get_bool(data or {}, 'compress_html', default=False),
                 }
             )
         except ValueError as exc:
@@ -706,7 +707,15 @@ def delete_log():
 @app.route('/report/<path:filename>')
 def serve_report(filename):
     """提供生成的报告文件"""
-    report_dir = os.path.join(HTML_LOGS_DIR, 'html_logs')
+    # 报告直接生成在 HTML_LOGS_DIR 下；旧版本放在其 html_logs 子目录
+    report_dir = HTML_LOGS_DIR
+    if not os.path.isfile(os.path.join(report_dir, filename)):
+        report_dir = os.path.join(HTML_LOGS_DIR, 'html_logs')
+    if filename.endswith('.html.gz'):
+        # 压缩报告原样下发，由浏览器按 Content-Encoding 解压
+        response = send_from_directory(report_dir, filename, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
     return send_from_directory(report_dir, filename)
 
 
@@ -980,8 +989,12 @@ def open_in_browser():
 
         logger.info(f"尝试在浏览器中打开: {url_or_path}")
 
+        # 压缩报告经 /report/ 下发（带 Content-Encoding），file:// 打开浏览器不会解压
+        if url_or_path.endswith('.html.gz') and os.path.isfile(url_or_path) and \
+                os.path.dirname(os.path.abspath(url_or_path)) == os.path.abspath(HTML_LOGS_DIR):
+            url = f"{request.host_url}report/{os.path.basename(url_or_path)}"
         # 如果是文件路径，转换为文件URL
-        if os.path.exists(url_or_path):
+        elif os.path.exists(url_or_path):
             # 转换为文件URL格式
             if platform.system() == 'Windows':
                 # Windows系统使用file:///格式
@@ -1103,6 +1116,7 @@ def api_exit():
         def _exit_later():
             import time, os
             time.sleep(0.5)
+            log_downloader.close()
             os._exit(0)
         threading = __import__('threading')
         t = threading.Thread(target=_exit_later, daemon=True)